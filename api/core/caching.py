@@ -28,12 +28,12 @@ def cache_result(duration: int = CACHE_DURATION) -> Callable:
             # Check if cached result exists and is still valid
             if cache_key in _cache:
                 cached_data, timestamp = _cache[cache_key]
-                if time.time() - timestamp < duration:
+                if time.monotonic() - timestamp < duration:
                     return cached_data
             
             # Execute function and cache result
             result = func(*args, **kwargs)
-            _cache[cache_key] = (result, time.time())
+            _cache[cache_key] = (result, time.monotonic())
             return result
         return wrapper
     return decorator
@@ -79,7 +79,7 @@ def clear_old_cache(max_age: int = 1800) -> int:
         Number of cache entries cleared
     """
     global _cache
-    current_time = time.time()
+    current_time = time.monotonic()
     keys_to_remove = []
     
     for key, (data, timestamp) in _cache.items():
@@ -99,7 +99,7 @@ def get_cache_stats() -> Dict[str, Any]:
     Returns:
         Dictionary containing cache statistics
     """
-    current_time = time.time()
+    current_time = time.monotonic()
     total_entries = len(_cache)
     
     if total_entries == 0:
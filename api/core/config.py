@@ -21,6 +21,9 @@ class Config:
 
     PERMANENT_SESSION_LIFETIME = timedelta(days=30)
 
+    # bcrypt work factor for new password hashes; existing hashes carry their own cost
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
     # Cloudflare
     CLOUDFLARE_SECRET = os.getenv("CLOUDFLARE_SECRET")
     CF_SITE_KEY = os.getenv("CF_SITE_KEY")
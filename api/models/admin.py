@@ -416,20 +416,48 @@ def get_dashboard_stats():
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     week_ago = now - timedelta(days=7)
 
-    total_users = users_collection.count_documents({})
-    new_users_today = users_collection.count_documents({"created_at": {"$gte": today_start}})
-    new_users_week = users_collection.count_documents({"created_at": {"$gte": week_ago}})
-    banned_users = users_collection.count_documents({"is_banned": True})
+    # Every users figure comes from one $facet pass; is_banned and role aren't indexed,
+    # so separate queries would mostly be collection scans of their own
+    users_pipeline = [
+        {
+            "$facet": {
+                "total": [{"$count": "n"}],
+                "today": [{"$match": {"created_at": {"$gte": today_start}}}, {"$count": "n"}],
+                "week": [{"$match": {"created_at": {"$gte": week_ago}}}, {"$count": "n"}],
+                "banned": [{"$match": {"is_banned": True}}, {"$count": "n"}],
+                # Role distribution
+                "roles": [{"$group": {"_id": {"$ifNull": ["$role", "user"]}, "count": {"$sum": 1}}}],
+                # Signups per day (last 7 days)
+                "signups": [
+                    {"$match": {"created_at": {"$gte": week_ago}}},
+                    {
+                        "$group": {
+                            "_id": {
+                                "$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}
+                            },
+                            "count": {"$sum": 1},
+                        }
+                    },
+                    {"$sort": {"_id": 1}},
+                ],
+            }
+        },
+    ]
+    users_facet = next(iter(users_collection.aggregate(users_pipeline)), {})
+
+    def facet_count(name):
+        rows = users_facet.get(name) or []
+        return rows[0]["n"] if rows else 0
+
+    total_users = facet_count("total")
+    new_users_today = facet_count("today")
+    new_users_week = facet_count("week")
+    banned_users = facet_count("banned")
     total_comments = comments_collection.count_documents({"deleted": False})
     report_counts = get_report_counts()
 
-    # Role distribution
-    role_pipeline = [
-        {"$group": {"_id": {"$ifNull": ["$role", "user"]}, "count": {"$sum": 1}}},
-    ]
-    role_results = list(users_collection.aggregate(role_pipeline))
     roles = {"user": 0, "mod": 0, "admin": 0}
-    for r in role_results:
+    for r in users_facet.get("roles") or []:
         role = r["_id"]
         if role in roles:
             roles[role] = r["count"]
@@ -448,20 +476,7 @@ def get_dashboard_stats():
         .limit(10)
     )
 
-    # Signups per day (last 7 days)
-    signup_pipeline = [
-        {"$match": {"created_at": {"$gte": week_ago}}},
-        {
-            "$group": {
-                "_id": {
-                    "$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}
-                },
-                "count": {"$sum": 1},
-            }
-        },
-        {"$sort": {"_id": 1}},
-    ]
-    signup_chart = list(users_collection.aggregate(signup_pipeline))
+    signup_chart = users_facet.get("signups") or []
 
     return {
         "total_users": total_users,
@@ -3,7 +3,10 @@ import time as _time
 import re as _re
 from datetime import datetime
 from bcrypt import hashpw, gensalt, checkpw
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError
 import logging
+from ..core.config import Config
 from ..core.db_connector import users_collection
 from ..core.caching import (
     cache_result, cache_user_data, cache_login_data, 
@@ -13,20 +16,55 @@ from ..core.caching import (
 
 logger = logging.getLogger(__name__)
 
-def generate_unique_id():
-    """Generate a unique 6-digit ID for a user."""
+# ─────────────────────────────────────────────────────────────────────────────
+# Index setup (on first lookup, so importing the module never waits on Mongo)
+# ─────────────────────────────────────────────────────────────────────────────
+
+_indexes_ready = False
+
+
+def _ensure_indexes():
+    # Logins, signup checks and OAuth lookups select users by these fields; without
+    # indexes each of them is a collection scan. Not unique, so existing data can't
+    # make creation fail.
+    global _indexes_ready
+    if _indexes_ready:
+        return
+    try:
+        users_collection.create_index([("username", ASCENDING)], name="users_username")
+        users_collection.create_index([("email", ASCENDING)], name="users_email", sparse=True)
+        users_collection.create_index(
+            [("anilist_id", ASCENDING)],
+            name="users_anilist_id",
+            partialFilterExpression={"anilist_id": {"$exists": True}},
+        )
+        # Recent-user listings sort by signup date
+        users_collection.create_index([("created_at", DESCENDING)], name="users_created")
+    except Exception:
+        pass  # Don't crash the app if index creation fails
+    _indexes_ready = True
+
+
+def _insert_with_unique_id(user_doc):
+    """
+    Insert a new user under a random 6-digit _id and return it.
+    The _id index already enforces uniqueness, so a collision is detected by the insert itself
+    rather than by a find_one round trip before it.
+    """
     while True:
-        _id = random.randint(100000, 999999)
-        if users_collection.find_one({"_id": _id}) is None:
-            return _id
+        user_doc["_id"] = random.randint(100000, 999999)
+        try:
+            users_collection.insert_one(user_doc)
+            return user_doc["_id"]
+        except DuplicateKeyError as e:
+            if "_id" not in ((e.details or {}).get("keyPattern") or {"_id": 1}):
+                raise
 
 def create_user(username, password, email=None):
     """Create a new user with a unique ID, including email support."""
-    _id = generate_unique_id()
-    hashed_password = hashpw(password.encode('utf-8'), gensalt())
+    hashed_password = hashpw(password.encode('utf-8'), gensalt(Config.BCRYPT_ROUNDS))
     
     user_doc = {
-        "_id": _id,
         "username": username,
         "password": hashed_password,
         "created_at": datetime.utcnow(),
@@ -37,18 +75,16 @@ def create_user(username, password, email=None):
     if email:
         user_doc["email"] = email
     
-    users_collection.insert_one(user_doc)
-    return _id  # Return the new user's ID
+    return _insert_with_unique_id(user_doc)  # Return the new user's ID
 
 def create_anilist_user(anilist_user_info, access_token):
     """Create a new user from AniList OAuth data."""
-    _id = generate_unique_id()
-    
     # Extract user information from AniList data and ensure no spaces
     raw_username = anilist_user_info['name']
     username = raw_username.replace(' ', '_')
     
     # Ensure username uniqueness
+    _ensure_indexes()
     base_name = username
     counter = 1
     while users_collection.find_one({"username": username}) is not None:
@@ -69,7 +105,6 @@ def create_anilist_user(anilist_user_info, access_token):
         }
     
     user_doc = {
-        "_id": _id,
         "username": username,
         "anilist_id": anilist_id,
         "anilist_access_token": access_token,
@@ -81,8 +116,7 @@ def create_anilist_user(anilist_user_info, access_token):
         "auth_method": "anilist"
     }
     
-    users_collection.insert_one(user_doc)
-    return _id
+    return _insert_with_unique_id(user_doc)
 
 def update_anilist_user(user_id, anilist_user_info, access_token):
     """Update existing user with latest AniList information."""
@@ -114,10 +148,12 @@ def update_anilist_user(user_id, anilist_user_info, access_token):
 
 def get_user_by_anilist_id(anilist_id):
     """Get user by AniList ID."""
+    _ensure_indexes()
     return users_collection.find_one({"anilist_id": anilist_id})
 
 def get_user(username, password):
     """Retrieve a user by username and password."""
+    _ensure_indexes()
     user = users_collection.find_one({"username": username})
     if user and user.get('password') and checkpw(password.encode('utf-8'), user['password']):
         return user
@@ -130,16 +166,19 @@ def get_user_by_id(_id):
 
 def get_user_by_email(email):
     """Get user by email (case-insensitive)."""
+    _ensure_indexes()
     return users_collection.find_one({"email": _re.compile(f'^{_re.escape(email)}$', _re.IGNORECASE)})
 
 def user_exists(username):
     """Check if a user with the given username already exists."""
+    _ensure_indexes()
     return users_collection.find_one({"username": username}) is not None
 
 def email_exists(email):
     """Check if a user with the given email already exists."""
     if not email:
         return False
+    _ensure_indexes()
     return users_collection.find_one({"email": email}) is not None
 
 def update_user_avatar(_id, avatar_url):
@@ -183,7 +222,7 @@ def change_password(_id, old_password, new_password):
         return False
     
     # Hash new password
-    new_hashed_password = hashpw(new_password.encode('utf-8'), gensalt())
+    new_hashed_password = hashpw(new_password.encode('utf-8'), gensalt(Config.BCRYPT_ROUNDS))
     
     current_version = user.get('password_version', 0)
     
@@ -208,7 +247,8 @@ def delete_user(_id):
 
 def get_all_users():
     """Get all users (for admin purposes - exclude passwords)."""
-    return list(users_collection.find({}, {"password": 0}))
+    # Large getMore batches: the whole collection is read, so fewer round trips past the first 101 docs
+    return list(users_collection.find({}, {"password": 0}).batch_size(1000))
 
 def get_user_count():
     """Get total number of users."""
@@ -228,6 +268,7 @@ def search_users(query, limit=10):
 
 def get_recent_users(limit=10):
     """Get recently registered users."""
+    _ensure_indexes()
     return list(users_collection.find({}, {"password": 0})
                 .sort("created_at", -1)
                 .limit(limit))
@@ -468,7 +509,7 @@ def clear_reset_code(email: str) -> None:
 
 def reset_password(email: str, new_password: str) -> bool:
     """Set a new password for the user identified by *email* (no old password needed)."""
-    hashed = hashpw(new_password.encode("utf-8"), gensalt())
+    hashed = hashpw(new_password.encode("utf-8"), gensalt(Config.BCRYPT_ROUNDS))
     
     user = users_collection.find_one({"email": email})
     if not user:
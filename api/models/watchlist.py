@@ -18,6 +18,11 @@ WATCHLIST_STATUSES = {
     'plan_to_watch': 'plan_to_watch'
 }
 
+# Each user's list is one document keyed by _id, and every query and update here
+# selects it by _id first; `watchlist.anime_id` matches and arrayFilters are then
+# evaluated inside that single document, which no secondary index can speed up.
+# A multikey index on `watchlist.anime_id` would only add index maintenance to
+# every array write, so none is created for it.
 def create_optimized_watchlist_indexes():
     """Create optimized database indexes for better performance."""
     try:
@@ -4,11 +4,14 @@ Direct replacement for Miruro API calls
 """
 import asyncio
 import logging
+import orjson
 import time
 import re
 from typing import Dict, Any, List
 import aiohttp
 
+from .http_session import get_session
+
 logger = logging.getLogger(__name__)
 
 ANILIST_GRAPHQL = "https://graphql.anilist.co"
@@ -19,6 +22,7 @@ class AnilistHomeService:
 
     def __init__(self):
         self._home_cache = None
+        self._home_counts: Dict[str, int] = {}
         self._home_cache_ts = 0.0
         self._home_cache_ttl = 300.0  # 5 minutes cache for blazing speed
 
@@ -90,30 +94,31 @@ class AnilistHomeService:
         """Make a GraphQL request to AniList with a timeout"""
         timeout = aiohttp.ClientTimeout(total=5)
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    ANILIST_GRAPHQL,
-                    json={'query': query, 'variables': variables or {}},
-                    headers={'Content-Type': 'application/json'}
-                ) as resp:
-                    if resp.status == 429:
-                        logger.warning("AniList rate limited, dropping request")
-                        return {}
-                    if resp.status != 200:
-                        logger.error(f"AniList API error {resp.status}")
-                        return {}
-                    data = await resp.json()
-                    if 'errors' in data:
-                        logger.error(f"AniList GraphQL errors: {data['errors']}")
-                        return {}
-                    return data.get('data', {})
+            session = await get_session(ANILIST_GRAPHQL)
+            async with session.post(
+                ANILIST_GRAPHQL,
+                json={'query': query, 'variables': variables or {}},
+                headers={'Content-Type': 'application/json'},
+                timeout=timeout,
+            ) as resp:
+                if resp.status == 429:
+                    logger.warning("AniList rate limited, dropping request")
+                    return {}
+                if resp.status != 200:
+                    logger.error(f"AniList API error {resp.status}")
+                    return {}
+                data = orjson.loads(await resp.read())
+                if 'errors' in data:
+                    logger.error(f"AniList GraphQL errors: {data['errors']}")
+                    return {}
+                return data.get('data', {})
         except Exception as e:
             logger.error(f"AniList request failed: {e}")
             return {}
 
     async def _fetch_home_data(self) -> Dict[str, Any]:
         """Fetch trending, popular, and recent from AniList GraphQL API using a single combined query"""
-        now = time.time()
+        now = time.monotonic()
         if self._home_cache and (now - self._home_cache_ts) < self._home_cache_ttl:
             return self._home_cache
 
@@ -232,7 +237,8 @@ class AnilistHomeService:
             }
 
             self._home_cache = normalized
-            self._home_cache_ts = time.time()
+            self._home_counts = {key: len(value) for key, value in normalized.items()}
+            self._home_cache_ts = time.monotonic()
             logger.info(
                 f"[AniListHome] Fetched: spotlight={len(spotlight)}, "
                 f"trending={len(trending)}, popular={len(popular)}, latest={len(latest)}"
@@ -270,10 +276,15 @@ class AnilistHomeService:
     async def home(self) -> Dict[str, Any]:
         """Get unified home response with all sections + metadata"""
         data = await self._fetch_home_data()
+        # The cached sections are shared, not copied; counts are computed once per refresh
+        if data is self._home_cache:
+            counts = self._home_counts
+        else:
+            counts = {key: len(value) for key, value in data.items()}
         return {
             "success": True,
-            "data": {key: value for key, value in data.items()},
-            "counts": {key: len(value) for key, value in data.items()},
+            "data": data,
+            "counts": counts,
         }
 
     async def get_studio_details(self, studio_id: int, page: int = 1) -> Dict[str, Any]:
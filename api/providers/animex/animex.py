@@ -127,7 +127,7 @@ class AnimexScraper:
                 return cached
             # Negative cache hit — tuple (None, expire_ts)
             if isinstance(cached, tuple) and len(cached) == 2:
-                if time.time() < cached[1]:
+                if time.monotonic() < cached[1]:
                     return None  # still within TTL, skip re-fetch
                 # Expired — fall through to re-fetch
 
@@ -150,7 +150,7 @@ class AnimexScraper:
             self._slug_cache[anilist_id] = slug
         else:
             # Negative cache with TTL so transient errors self-heal
-            self._slug_cache[anilist_id] = (None, time.time() + self._NEG_CACHE_TTL)
+            self._slug_cache[anilist_id] = (None, time.monotonic() + self._NEG_CACHE_TTL)
             logger.info(f"[AnimeX] No slug found for anilist_id={anilist_id} (cached for {self._NEG_CACHE_TTL}s)")
         return slug
 
@@ -0,0 +1,154 @@
+"""
+Shared aiohttp sessions for provider HTTP calls
+Sessions are pooled per upstream host so scrapers hitting the same API reuse
+connections. Routes drive the scrapers through asyncio.run(), so the pool is
+kept per event loop and closed automatically when that loop shuts down.
+"""
+import asyncio
+import logging
+import threading
+from typing import Dict, Tuple, AsyncGenerator, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+import orjson
+
+try:
+    # c-ares resolver: DNS lookups stay on the loop instead of a worker thread
+    import aiodns  # noqa: F401
+    from aiohttp.resolver import AsyncResolver
+except ImportError:
+    AsyncResolver = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# Idle keep-alive sockets outlive a rate-limit pause (aiohttp's default is 15s)
+KEEPALIVE_TIMEOUT = 60
+
+# Requests slower than this are logged with their upstream host
+SLOW_REQUEST_SECONDS = 3.0
+
+# event loop -> ({scheme://host -> session}, closer generator keeping it registered with the loop)
+_sessions: Dict[asyncio.AbstractEventLoop, Tuple[Dict[str, aiohttp.ClientSession], AsyncGenerator]] = {}
+# Flask serves requests on several threads, each registering and pruning loops here
+_sessions_lock = threading.Lock()
+
+
+def _host_key(url: Optional[str]) -> str:
+    if not url:
+        return ""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+async def _on_request_start(session, ctx, params) -> None:
+    ctx.start = asyncio.get_running_loop().time()
+
+
+async def _on_request_end(session, ctx, params) -> None:
+    elapsed = asyncio.get_running_loop().time() - getattr(ctx, "start", 0.0)
+    if elapsed >= SLOW_REQUEST_SECONDS:
+        host = params.url.host or ""
+        logger.warning(f"[HttpSession] Slow upstream {host}: {elapsed:.2f}s ({params.method} {params.url.path})")
+
+
+def _json_dumps(obj) -> str:
+    # `json=` bodies are encoded with orjson instead of the stdlib encoder
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _connector() -> aiohttp.TCPConnector:
+    resolver = AsyncResolver() if AsyncResolver is not None else None
+    return aiohttp.TCPConnector(
+        limit=100, ttl_dns_cache=300, keepalive_timeout=KEEPALIVE_TIMEOUT, resolver=resolver
+    )
+
+
+def _trace_config() -> aiohttp.TraceConfig:
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(_on_request_start)
+    trace.on_request_end.append(_on_request_end)
+    # Timeouts and connection failures are the slow cases that matter most
+    trace.on_request_exception.append(_on_request_end)
+    return trace
+
+
+async def _close_on_loop_shutdown(
+    loop: asyncio.AbstractEventLoop, pool: Dict[str, aiohttp.ClientSession]
+) -> AsyncGenerator[None, None]:
+    """
+    Parked at its first yield for the lifetime of the loop.
+    asyncio.run() finalizes live async generators (shutdown_asyncgens) before
+    closing the loop, which runs this finally block on the owning loop.
+    """
+    try:
+        yield
+    finally:
+        with _sessions_lock:
+            _sessions.pop(loop, None)
+        for session in pool.values():
+            if not session.closed:
+                await session.close()
+
+
+def _discard_pool(pool: Dict[str, aiohttp.ClientSession]) -> None:
+    """
+    Release the sessions of a loop that was closed without finalizing its generators.
+    session.close() can't be awaited on a closed loop, so the connectors are closed
+    directly (synchronous in aiohttp) and the sessions detached.
+    """
+    for session in pool.values():
+        if session.closed:
+            continue
+        connector = session.connector
+        if connector is not None:
+            try:
+                waiter = connector.close()
+                if asyncio.iscoroutine(waiter):
+                    # A coroutine close() can't run without a live loop; drop it quietly
+                    waiter.close()
+            except Exception as e:
+                logger.debug("[HttpSession] Closing stale connector failed: %s", e)
+        session.detach()
+
+
+async def get_session(url: Optional[str] = None) -> aiohttp.ClientSession:
+    """
+    Return the aiohttp session shared by every caller on the running loop
+    for the host of `url` (or a generic session when no url is given).
+    """
+    loop = asyncio.get_running_loop()
+    key = _host_key(url)
+
+    with _sessions_lock:
+        entry = _sessions.get(loop)
+        stale_pools = []
+        if entry is None:
+            # Drop pools of loops that were closed without finalizing generators
+            for stale in [l for l in _sessions if l.is_closed()]:
+                stale_pools.append(_sessions.pop(stale)[0])
+
+            pool: Dict[str, aiohttp.ClientSession] = {}
+            closer = _close_on_loop_shutdown(loop, pool)
+            _sessions[loop] = (pool, closer)
+        else:
+            pool = entry[0]
+            closer = None
+
+    for stale_pool in stale_pools:
+        _discard_pool(stale_pool)
+    if closer is not None:
+        await closer.__anext__()
+
+    session = pool.get(key)
+    if session is None or session.closed:
+        session = aiohttp.ClientSession(
+            timeout=DEFAULT_TIMEOUT,
+            connector=_connector(),
+            trace_configs=[_trace_config()],
+            json_serialize=_json_dumps,
+        )
+        pool[key] = session
+    return session
@@ -11,6 +11,7 @@ that cards rendered from Jikan data still link to /watch/<anilist_id>.
 
 import asyncio
 import logging
+import orjson
 import re
 import time
 from typing import Dict, Any, List, Optional
@@ -77,7 +78,7 @@ class MalFallbackService:
                         if resp.status != 200:
                             logger.error(f"[MalFallback] Jikan {resp.status} for {url}")
                             return {}
-                        return await resp.json()
+                        return orjson.loads(await resp.read())
             except Exception as e:
                 logger.error(f"[MalFallback] Jikan request failed for {url}: {e}")
                 return {}
@@ -88,7 +89,7 @@ class MalFallbackService:
 
     async def _ensure_mapping(self) -> None:
         """Load or refresh the MAL ↔ AniList mapping file."""
-        now = time.time()
+        now = time.monotonic()
         if self._mapping and (now - self._mapping_ts) < self._mapping_ttl:
             return
 
@@ -99,10 +100,10 @@ class MalFallbackService:
                     if resp.status != 200:
                         logger.error(f"[MalFallback] Mapping fetch failed: {resp.status}")
                         return
-                    data = await resp.json(content_type=None)
+                    data = orjson.loads(await resp.read())
 
             self._mapping = data
-            self._mapping_ts = time.time()
+            self._mapping_ts = time.monotonic()
 
             # Build bidirectional lookup dicts
             mal_to_al: Dict[int, int] = {}
@@ -484,7 +485,7 @@ class MalFallbackService:
 
     async def home(self) -> Dict[str, Any]:
         """Fetch home page data from Jikan as fallback."""
-        now = time.time()
+        now = time.monotonic()
         if self._home_cache and (now - self._home_cache_ts) < self._home_cache_ttl:
             return self._home_cache
 
@@ -572,7 +573,7 @@ class MalFallbackService:
             }
 
             self._home_cache = result
-            self._home_cache_ts = time.time()
+            self._home_cache_ts = time.monotonic()
             logger.info(
                 f"[MalFallback] Home fetched: spotlight={len(spotlight)}, "
                 f"trending={len(trending)}, popular={len(popular)}, latest={len(latest)}"
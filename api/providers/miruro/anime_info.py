@@ -3,12 +3,16 @@ Anime information fetching for Miruro API
 Handles detailed anime data including relations and characters
 """
 import logging
+import orjson
 import aiohttp
 from typing import Dict, Any, List, Optional
 from .base import MiruroBaseClient
+from ..http_session import get_session
 
 logger = logging.getLogger(__name__)
 
+ANILIST_GRAPHQL = "https://graphql.anilist.co"
+
 
 class MiruroAnimeInfoService:
     """Service for fetching anime information from Miruro API"""
@@ -51,18 +55,19 @@ class MiruroAnimeInfoService:
         resp = None
         timeout = aiohttp.ClientTimeout(total=5)
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    "https://graphql.anilist.co",
-                    json={"query": query, "variables": {"id": int(anilist_id)}}
-                ) as r:
-                    if r.status == 429:
-                        logger.warning("Anilist rate limited (info fetch), dropping request")
-                    elif r.status != 200:
-                        logger.error(f"Anilist info fetch failed with status {r.status}")
-                    else:
-                        data = await r.json()
-                        resp = data.get("data", {}).get("Media")
+            session = await get_session(ANILIST_GRAPHQL)
+            async with session.post(
+                ANILIST_GRAPHQL,
+                json={"query": query, "variables": {"id": int(anilist_id)}},
+                timeout=timeout,
+            ) as r:
+                if r.status == 429:
+                    logger.warning("Anilist rate limited (info fetch), dropping request")
+                elif r.status != 200:
+                    logger.error(f"Anilist info fetch failed with status {r.status}")
+                else:
+                    data = orjson.loads(await r.read())
+                    resp = data.get("data", {}).get("Media")
         except Exception as e:
             logger.error(f"Anilist info fetch failed: {e}")
 
@@ -134,8 +139,11 @@ class MiruroAnimeInfoService:
         }
         status = status_map.get(resp.get("status", ""), resp.get("status", ""))
 
-        # Episode counts
+        # Episode counts. AniList sends a count; the Miruro info payload may
+        # embed the raw episode list instead, so count that.
         total_episodes = resp.get("episodes") or 0
+        if isinstance(total_episodes, list):
+            total_episodes = len(total_episodes)
         # For currently airing shows, released = nextAiringEpisode.episode - 1
         if next_airing and next_airing.get("episode"):
             released_episodes = next_airing["episode"] - 1
@@ -281,14 +289,15 @@ class MiruroAnimeInfoService:
         '''
         timeout = aiohttp.ClientTimeout(total=5)
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    "https://graphql.anilist.co",
-                    json={"query": query, "variables": {"id": int(anilist_id)}}
-                ) as r:
-                    if r.status == 200:
-                        data = await r.json()
-                        return data.get("data", {}).get("Media", {}).get("relations", {}).get("edges", [])
+            session = await get_session(ANILIST_GRAPHQL)
+            async with session.post(
+                ANILIST_GRAPHQL,
+                json={"query": query, "variables": {"id": int(anilist_id)}},
+                timeout=timeout,
+            ) as r:
+                if r.status == 200:
+                    data = orjson.loads(await r.read())
+                    return data.get("data", {}).get("Media", {}).get("relations", {}).get("edges", [])
         except Exception as e:
             logger.error(f"Anilist relations fetch failed for {anilist_id}: {e}")
         return []
@@ -300,16 +309,27 @@ class MiruroAnimeInfoService:
         sequels = []
 
         # 1. First collect direct relations for the 'related' list (spin-offs, side stories, etc.)
+        #    and split out the direct prequel/sequel edges in the same pass, so the
+        #    relation type is normalized once per edge.
+        related_append = related.append
+        curr_p_edges = []
+        curr_s_edges = []
         for edge in edges:
+            if not isinstance(edge, dict):
+                continue
             entry = self._build_relation_entry(edge)
             if entry:
-                related.append(entry)
+                related_append(entry)
+            rel_type = (edge.get("relationType") or "").upper()
+            if rel_type == "PREQUEL":
+                curr_p_edges.append(edge)
+            elif rel_type == "SEQUEL":
+                curr_s_edges.append(edge)
 
         root_id_str = str(root_id) if root_id else ""
 
         # 2. Traverse all prequels (backward in time)
         seen_prequel_ids = {root_id_str} if root_id_str else set()
-        curr_p_edges = [e for e in edges if isinstance(e, dict) and (e.get("relationType") or "").upper() == "PREQUEL"]
 
         while curr_p_edges:
             next_p_edges = []
@@ -339,7 +359,6 @@ class MiruroAnimeInfoService:
 
         # 3. Traverse all sequels (forward in time)
         seen_sequel_ids = {root_id_str} if root_id_str else set()
-        curr_s_edges = [e for e in edges if isinstance(e, dict) and (e.get("relationType") or "").upper() == "SEQUEL"]
 
         while curr_s_edges:
             next_s_edges = []
@@ -469,16 +488,17 @@ class MiruroAnimeInfoService:
         resp = None
         timeout = aiohttp.ClientTimeout(total=5)
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    "https://graphql.anilist.co",
-                    json={"query": query, "variables": {"id": int(anilist_id)}}
-                ) as r:
-                    if r.status == 429:
-                        logger.warning("Anilist rate limited (next ep fetch), dropping request")
-                    elif r.status == 200:
-                        data = await r.json()
-                        resp = data.get("data", {}).get("Media")
+            session = await get_session(ANILIST_GRAPHQL)
+            async with session.post(
+                ANILIST_GRAPHQL,
+                json={"query": query, "variables": {"id": int(anilist_id)}},
+                timeout=timeout,
+            ) as r:
+                if r.status == 429:
+                    logger.warning("Anilist rate limited (next ep fetch), dropping request")
+                elif r.status == 200:
+                    data = orjson.loads(await r.read())
+                    resp = data.get("data", {}).get("Media")
         except Exception as e:
             logger.error(f"Anilist next ep fetch failed: {e}")
 
@@ -5,8 +5,11 @@ Handles retries, timeouts, and error handling
 import aiohttp
 import asyncio
 import logging
+import orjson
 from typing import Optional, Dict, Any, Union
 
+from ..http_session import get_session
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,37 +39,58 @@ class MiruroBaseClient:
         Returns:
             JSON response dict or None on failure
         """
+        body = await self._get_bytes(endpoint, params, headers, raise_for_status)
+        if body is None:
+            return None
+        # Parse the raw body directly; skips aiohttp's bytes -> str -> json hop
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            text = body[:200].decode("utf-8", errors="replace")
+            logger.error(f"[MiruroAPI] Failed to parse JSON from {endpoint}: {text}")
+            return None
+
+    async def _get_bytes(
+        self,
+        endpoint: str,
+        params: Optional[Dict[str, Union[str, int]]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        raise_for_status: bool = False
+    ) -> Optional[bytes]:
+        """
+        Make GET request with retry logic and return the undecoded body.
+        Transport only: _get decodes the JSON and handles parse failures.
+
+        Returns:
+            Response body bytes or None on failure
+        """
         params = params or {}
         headers = {**self.default_headers, **(headers or {})}
         url = f"{self.base_url}/{endpoint.lstrip('/')}"
         tries = 1
         backoff = 0.5
-        timeout = aiohttp.ClientTimeout(total=8)
+        # Per-phase limits: fail fast on a dead host instead of waiting out the total
+        timeout = aiohttp.ClientTimeout(total=6, connect=1.5, sock_connect=1.5, sock_read=3)
 
         for attempt in range(1, tries + 1):
             try:
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.get(url, params=params, headers=headers) as resp:
-                        if resp.status >= 400:
-                            logger.warning(
-                                f"[MiruroAPI] {url} returned {resp.status} (attempt {attempt}/{tries})"
+                session = await get_session(self.base_url)
+                async with session.get(url, params=params, headers=headers, timeout=timeout) as resp:
+                    if resp.status >= 400:
+                        logger.warning(
+                            f"[MiruroAPI] {url} returned {resp.status} (attempt {attempt}/{tries})"
+                        )
+                        if raise_for_status:
+                            raise aiohttp.ClientResponseError(
+                                status=resp.status,
+                                request_info=resp.request_info,
+                                history=resp.history
                             )
-                            if raise_for_status:
-                                raise aiohttp.ClientResponseError(
-                                    status=resp.status,
-                                    request_info=resp.request_info,
-                                    history=resp.history
-                                )
-                            if attempt == tries:
-                                return None
-                            await asyncio.sleep(backoff * attempt)
-                            continue
-                        try:
-                            return await resp.json()
-                        except Exception:
-                            text = await resp.text()
-                            logger.error(f"[MiruroAPI] Failed to parse JSON from {url}: {text[:200]}")
+                        if attempt == tries:
                             return None
+                        await asyncio.sleep(backoff * attempt)
+                        continue
+                    return await resp.read()
             except asyncio.TimeoutError:
                 logger.warning(f"[MiruroAPI] Timeout for {url} (attempt {attempt}/{tries})")
                 if attempt == tries:
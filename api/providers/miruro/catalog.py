@@ -3,13 +3,16 @@ Catalog browsing functionality for Miruro API
 Handles genre, category, and schedule queries
 """
 import logging
-import aiohttp
+import orjson
 import time
 from typing import Dict, Any
 from .base import MiruroBaseClient
+from ..http_session import get_session
 
 logger = logging.getLogger(__name__)
 
+ANILIST_GRAPHQL = "https://graphql.anilist.co"
+
 
 class MiruroCatalogService:
     """Service for browsing anime catalogs via Miruro API"""
@@ -49,12 +52,11 @@ class MiruroCatalogService:
 
     async def _fallback_anilist_query(self, query: str, variables: dict) -> Dict[str, Any]:
         """Execute a GraphQL query against AniList API as fallback"""
-        url = "https://graphql.anilist.co"
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json={"query": query, "variables": variables}) as resp:
-                    if resp.status == 200:
-                        return await resp.json()
+            session = await get_session(ANILIST_GRAPHQL)
+            async with session.post(ANILIST_GRAPHQL, json={"query": query, "variables": variables}) as resp:
+                if resp.status == 200:
+                    return orjson.loads(await resp.read())
         except Exception as e:
             logger.error(f"AniList fallback query failed: {e}")
         return {}
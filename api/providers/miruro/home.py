@@ -11,6 +11,8 @@ from .base import MiruroBaseClient
 
 logger = logging.getLogger(__name__)
 
+_EMPTY: Dict[str, Any] = {}
+
 
 class MiruroHomeService:
     """Service for fetching and caching home page data from Miruro API"""
@@ -18,6 +20,7 @@ class MiruroHomeService:
     def __init__(self, client: MiruroBaseClient):
         self.client = client
         self._home_cache = None
+        self._home_counts: Dict[str, int] = {}
         self._home_cache_ts = 0.0
         self._home_cache_ttl = 30.0  # 30 seconds cache
 
@@ -86,7 +89,7 @@ class MiruroHomeService:
 
     async def _fetch_home_data(self) -> Dict[str, Any]:
         """Fetch trending, popular, and recent from Miruro API in parallel"""
-        now = time.time()
+        now = time.monotonic()
         if self._home_cache and (now - self._home_cache_ts) < self._home_cache_ttl:
             return self._home_cache
 
@@ -171,7 +174,8 @@ class MiruroHomeService:
             }
 
             self._home_cache = normalized
-            self._home_cache_ts = time.time()
+            self._home_counts = {key: len(value) for key, value in normalized.items()}
+            self._home_cache_ts = time.monotonic()
             logger.info(
                 f"[MiruroHome] Fetched: spotlight={len(spotlight)}, "
                 f"trending={len(trending)}, popular={len(popular)}, latest={len(latest)}"
@@ -192,30 +196,41 @@ class MiruroHomeService:
     async def home(self) -> Dict[str, Any]:
         """Get unified home response with all sections + metadata"""
         data = await self._fetch_home_data()
+        # The cached sections are shared, not copied; counts are computed once per refresh
+        if data is self._home_cache:
+            counts = self._home_counts
+        else:
+            counts = {key: len(value) for key, value in data.items()}
         return {
             "success": True,
-            "data": {key: value for key, value in data.items()},
-            "counts": {key: len(value) for key, value in data.items()},
+            "data": data,
+            "counts": counts,
         }
 
     def _annotate_episodes_count(self, animes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Add episode count annotations to anime list"""
         out = []
+        append = out.append
         for a in animes:
-            copy = dict(a)
-            eps = copy.get("episodes") or {}
-            try:
-                sub = int(eps.get("sub", 0) or 0)
-            except Exception:
-                sub = 0
-            try:
-                dub = int(eps.get("dub", 0) or 0)
-            except Exception:
-                dub = 0
+            copy = a.copy()
+            eps = copy.get("episodes") or _EMPTY
+            sub = eps.get("sub") or 0
+            dub = eps.get("dub") or 0
+            # Values from the API are normally ints already; only coerce strays
+            if type(sub) is not int:
+                try:
+                    sub = int(sub)
+                except Exception:
+                    sub = 0
+            if type(dub) is not int:
+                try:
+                    dub = int(dub)
+                except Exception:
+                    dub = 0
             copy["episodesSub"] = sub
             copy["episodesDub"] = dub
             copy["episodesCount"] = sub + dub
-            out.append(copy)
+            append(copy)
         return out
 
     def clear_home_cache(self) -> None:
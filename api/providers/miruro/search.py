@@ -3,12 +3,15 @@ Search functionality for Miruro API
 Handles search queries and autocomplete suggestions
 """
 import logging
-import aiohttp
+import orjson
 from typing import Dict, Any, Optional
 from .base import MiruroBaseClient
+from ..http_session import get_session
 
 logger = logging.getLogger(__name__)
 
+ANILIST_GRAPHQL = "https://graphql.anilist.co"
+
 
 class MiruroSearchService:
     """Service for anime search operations via Miruro API"""
@@ -101,13 +104,13 @@ class MiruroSearchService:
         }
         '''
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://graphql.anilist.co",
-                    json={"query": query, "variables": {"search": q, "page": page, "perPage": 20}}
-                ) as r:
-                    data = await r.json()
-                    page_data = data.get("data", {}).get("Page", {})
+            session = await get_session(ANILIST_GRAPHQL)
+            async with session.post(
+                ANILIST_GRAPHQL,
+                json={"query": query, "variables": {"search": q, "page": page, "perPage": 20}}
+            ) as r:
+                data = orjson.loads(await r.read())
+                page_data = data.get("data", {}).get("Page", {})
         except Exception as e:
             logger.error(f"Anilist search fetch failed: {e}")
             page_data = {}
@@ -162,13 +165,13 @@ class MiruroSearchService:
         }
         '''
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://graphql.anilist.co",
-                    json={"query": query, "variables": {"search": q}}
-                ) as r:
-                    data = await r.json()
-                    suggestions = data.get("data", {}).get("Page", {}).get("media", [])
+            session = await get_session(ANILIST_GRAPHQL)
+            async with session.post(
+                ANILIST_GRAPHQL,
+                json={"query": query, "variables": {"search": q}}
+            ) as r:
+                data = orjson.loads(await r.read())
+                suggestions = data.get("data", {}).get("Page", {}).get("media", [])
         except Exception as e:
             logger.error(f"Anilist suggestions fetch failed: {e}")
             suggestions = []
@@ -238,13 +241,13 @@ class MiruroSearchService:
         }
         '''
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    "https://graphql.anilist.co",
-                    json={"query": query, "variables": {"page": page, "perPage": 24}}
-                ) as r:
-                    data = await r.json()
-                    page_data = data.get("data", {}).get("Page", {})
+            session = await get_session(ANILIST_GRAPHQL)
+            async with session.post(
+                ANILIST_GRAPHQL,
+                json={"query": query, "variables": {"page": page, "perPage": 24}}
+            ) as r:
+                data = orjson.loads(await r.read())
+                page_data = data.get("data", {}).get("Page", {})
         except Exception as e:
             logger.error(f"Anilist az_list fetch failed: {e}")
             page_data = {}
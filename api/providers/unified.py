@@ -7,6 +7,7 @@ import re
 from typing import Optional, Dict, Any, Union
 from urllib.parse import parse_qs
 
+from .http_session import get_session
 from .miruro import MiruroScraper
 from .anilist_home import AnilistHomeService
 from .animex import AnimexScraper
@@ -331,15 +332,14 @@ class UnifiedScraper:
             embed_url = f"https://anixtv.in/anime-watch?action=hindi_1_player&id={anilist_id}&season=1&episode={ep_num}"
 
             try:
-                import aiohttp
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(embed_url, timeout=5) as resp:
-                        text = await resp.text()
-                        if "We couldn't find a Hindi Dub" in text or "Error: Could not map" in text or "<iframe" not in text:
-                            return {
-                                "error": "no_sources",
-                                "message": "Hindi dub is not available for this episode on AnixTv.",
-                            }
+                session = await get_session()
+                async with session.get(embed_url, timeout=5) as resp:
+                    text = await resp.text()
+                    if "We couldn't find a Hindi Dub" in text or "Error: Could not map" in text or "<iframe" not in text:
+                        return {
+                            "error": "no_sources",
+                            "message": "Hindi dub is not available for this episode on AnixTv.",
+                        }
             except Exception as e:
                 logger.warning(f"[UnifiedScraper] AnixTv verification failed: {e}")
 
@@ -7,6 +7,7 @@ import base64
 import json
 import os
 import re
+from functools import lru_cache
 from typing import Optional, List, Dict, Any, Union
 from urllib.parse import quote
 
@@ -105,24 +106,33 @@ def encode_proxy(
         return url
 
     try:
-        encoded_url = quote(url, safe="")
+        # Keep normal JSON structure; the serialized form doubles as cache key
+        headers_json = json.dumps(headers) if headers else ""
+        return _build_cdn_proxy_url(url, headers_json)
 
-        query = f"?url={encoded_url}"
+    except Exception:
+        return url
 
-        if headers:
-            # Keep normal JSON structure
-            encoded_headers = quote(json.dumps(headers), safe="")
-            query += f"&headers={encoded_headers}"
 
-        result = f"{CDN_PROXY_URL}{query}"
+@lru_cache(maxsize=4096)
+def _build_cdn_proxy_url(url: str, headers_json: str) -> str:
+    """
+    Memoised body of encode_proxy.
 
-        if result.startswith("http://"):
-            result = result.replace("http://", "https://", 1)
+    Playback requests keep re-proxying the same CDN URLs and subtitle files,
+    so the quoting work is done once per distinct (url, headers) pair.
+    """
+    query = f"?url={quote(url, safe='')}"
 
-        return result
+    if headers_json:
+        query += f"&headers={quote(headers_json, safe='')}"
 
-    except Exception:
-        return url
+    result = f"{CDN_PROXY_URL}{query}"
+
+    if result.startswith("http://"):
+        result = result.replace("http://", "https://", 1)
+
+    return result
 
 
 # ── Backward compatibility wrappers ──────────────────────────────────────────
@@ -335,6 +345,36 @@ def sort_subtitle_priority(track: Dict[str, Any]) -> int:
     return 10
 
 
+def partition_subtitle_tracks(tracks: List[Any]) -> List[Any]:
+    """
+    Order tracks the same way as sorting by sort_subtitle_priority, in one pass.
+
+    The priority only takes a handful of values, so a stable bucket partition
+    gives the identical order without a key call per comparison.
+    """
+    english: List[Any] = []
+    default: List[Any] = []
+    other: List[Any] = []
+    invalid: List[Any] = []
+    thumbnails: List[Any] = []
+
+    for track in tracks:
+        if not isinstance(track, dict):
+            invalid.append(track)
+            continue
+        lang_label = (track.get("lang") or track.get("label") or "").lower()
+        if "thumbnail" in lang_label:
+            thumbnails.append(track)
+        elif "en" in lang_label:  # covers "english" / "eng" / "en"
+            english.append(track)
+        elif track.get("default") is True:
+            default.append(track)
+        else:
+            other.append(track)
+
+    return english + default + other + invalid + thumbnails
+
+
 # ── Main proxy dispatcher ────────────────────────────────────────────────────
 def proxy_video_sources(
     data: Dict[str, Any],
@@ -402,7 +442,7 @@ def proxy_video_sources(
                 if track.get(k):
                     track[k] = _pick(track[k], for_subtitles=True)
         try:
-            tracks.sort(key=sort_subtitle_priority)
+            tracks[:] = partition_subtitle_tracks(tracks)
         except Exception:
             pass
 
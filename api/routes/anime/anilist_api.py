@@ -16,6 +16,10 @@ from ...utils.helpers import (
 anilist_api_bp = Blueprint('anilist_api', __name__)
 logger = logging.getLogger(__name__)
 
+# Users with a background sync running; repeat requests join it instead of starting another
+_inflight_syncs = set()
+_inflight_lock = threading.Lock()
+
 
 @anilist_api_bp.route('/status', methods=['GET'])
 def get_anilist_status():
@@ -52,6 +56,7 @@ def sync_anilist():
     if 'username' not in session or '_id' not in session:
         return jsonify({'success': False, 'message': 'Not logged in.'}), 401
     
+    claimed = started = False
     try:
         user_id = session.get('_id')
         user = get_user_by_id(user_id)
@@ -61,6 +66,17 @@ def sync_anilist():
         
         access_token = user['anilist_access_token']
         
+        with _inflight_lock:
+            already_running = user_id in _inflight_syncs
+            _inflight_syncs.add(user_id)
+        if already_running:
+            return jsonify({
+                'success': True,
+                'message': 'Sync already in progress',
+                'status': 'in_progress'
+            }), 202
+        claimed = True
+        
         # Initialize progress
         store_sync_progress(user_id, {
             'status': 'starting',
@@ -118,7 +134,9 @@ def sync_anilist():
                     
                     is_success = success_rate >= 70.0
                     
-                    if is_success:
+                    if result.get('unchanged'):
+                        message = '✓ Already up to date — nothing changed on AniList'
+                    elif is_success:
                         parts = [f'✓ Sync completed! {synced_count} anime synced']
                         if failed_count:
                             parts.append(f'{failed_count} not found')
@@ -153,10 +171,18 @@ def sync_anilist():
                         'error': str(e)
                     })
 
+        def run_sync(app, user_id, access_token):
+            try:
+                background_sync(app, user_id, access_token)
+            finally:
+                with _inflight_lock:
+                    _inflight_syncs.discard(user_id)
+        
         # Start background thread
-        thread = threading.Thread(target=background_sync, args=(app, user_id, access_token))
+        thread = threading.Thread(target=run_sync, args=(app, user_id, access_token))
         thread.daemon = True
         thread.start()
+        started = True
         
         return jsonify({
             'success': True, 
@@ -165,6 +191,9 @@ def sync_anilist():
         }), 202
         
     except Exception as e:
+        if claimed and not started:
+            with _inflight_lock:
+                _inflight_syncs.discard(user_id)
         logger.error(f"Error starting AniList sync: {e}")
         return jsonify({'success': False, 'message': 'Failed to start sync.'}), 500
 
@@ -4,6 +4,7 @@ Fetches opening/ending theme data from https://api.animethemes.moe
 """
 import aiohttp
 import logging
+import orjson
 from flask import Blueprint, jsonify, request
 
 logger = logging.getLogger(__name__)
@@ -21,7 +22,7 @@ async def _fetch_themes_by_slug(slug: str) -> dict:
         async with aiohttp.ClientSession() as session:
             async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = orjson.loads(await resp.read())
                     return data.get("anime", {})
                 return {}
     except Exception as e:
@@ -36,7 +37,7 @@ async def _search_anime_slug(title: str) -> str:
         async with aiohttp.ClientSession() as session:
             async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = orjson.loads(await resp.read())
                     anime_list = data.get("search", {}).get("anime", [])
                     if anime_list:
                         # Try exact match first
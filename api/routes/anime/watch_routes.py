@@ -7,7 +7,6 @@ import asyncio
 import re
 import logging
 import time
-import aiohttp
 from flask import (
     Blueprint,
     request,
@@ -22,6 +21,7 @@ from flask import (
 from urllib.parse import parse_qs
 
 from ...models.watchlist import get_watchlist_entry
+from ...providers.http_session import get_session
 from ...providers.video_utils import WORKER_BASE, proxy_video_sources
 
 watch_routes_bp = Blueprint("watch_routes", __name__)
@@ -394,6 +394,8 @@ def watch(anime_id, ep_number):
     anime_id_clean = anime_id.split("?", 1)[0]
 
     try:
+        # Info comes first: its title gives the anime_slug the episodes fetch needs for
+        # anidap discovery, and that result is what EPS_CACHE keeps
         anime_info = asyncio.run(current_app.ha_scraper.get_anime_info(anime_id_clean))
         if isinstance(anime_info, dict):
             if "info" in anime_info and isinstance(anime_info["info"], dict):
@@ -606,11 +608,11 @@ def watch(anime_id, ep_number):
         try:
             async def check_hindi():
                 embed_url = f"https://anixtv.in/anime-watch?action=hindi_1_player&id={anilist_id}&season=1&episode={ep_number}"
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(embed_url, timeout=7) as resp:
-                        text = await resp.text()
-                        if "We couldn't find a Hindi Dub" not in text and "Error: Could not map" not in text and "<iframe" in text:
-                            return True
+                session = await get_session()
+                async with session.get(embed_url, timeout=7) as resp:
+                    text = await resp.text()
+                    if "We couldn't find a Hindi Dub" not in text and "Error: Could not map" not in text and "<iframe" in text:
+                        return True
                 return False
 
             try:
@@ -287,7 +287,7 @@ def forgot_password():
 
     # Generate 6-digit numeric code
     code = f"{random.randint(0, 999999):06d}"
-    hashed_code = hashpw(code.encode('utf-8'), gensalt())
+    hashed_code = hashpw(code.encode('utf-8'), gensalt(Config.BCRYPT_ROUNDS))
     expires_at = datetime.utcnow() + timedelta(minutes=5)
 
     stored = store_reset_code(email, hashed_code, expires_at)
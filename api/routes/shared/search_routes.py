@@ -17,12 +17,8 @@ def search():
         return redirect(url_for('home_routes.home'))
 
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        results = loop.run_until_complete(
-            current_app.ha_scraper.search(search_query)
-        )
-        loop.close()
+        # asyncio.run finalizes the loop's async generators, which closes its pooled sessions
+        results = asyncio.run(current_app.ha_scraper.search(search_query))
 
         animes = results.get("animes") or results.get("data") or []
 
@@ -62,12 +58,7 @@ def search_suggestions_route():
         return jsonify({"suggestions": []})
 
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        suggestions = loop.run_until_complete(
-            current_app.ha_scraper.search_suggestions(query)
-        )
-        loop.close()
+        suggestions = asyncio.run(current_app.ha_scraper.search_suggestions(query))
 
         return jsonify(suggestions)
 
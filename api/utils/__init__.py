@@ -1,14 +1,17 @@
 """
 Utils package initialization.
 Re-exports commonly used utility functions for easier imports.
+The re-exports resolve lazily (PEP 562), so importing a single submodule such as
+`utils.moderation` doesn't pull in the AniList sync and provider stack.
 """
+import importlib
 
 __all__ = [
     # AniList sync functions
     'sync_anilist_watchlist_to_local',
     'BatchConfig',
     'SyncProgress',
-    
+
     # Helper functions
     'verify_turnstile',
     'get_anilist_user_info',
@@ -17,23 +20,32 @@ __all__ = [
     'get_sync_progress',
     'clear_sync_progress',
     'enrich_watchlist_item',
-
 ]
 
-# Import from ani_to_yume
-from .ani_to_yume import (
-    sync_anilist_watchlist_to_local,
-    BatchConfig,
-    SyncProgress,
-)
+# name -> submodule it is re-exported from
+_LAZY = {
+    'sync_anilist_watchlist_to_local': '.ani_to_yume',
+    'BatchConfig': '.ani_to_yume',
+    'SyncProgress': '.ani_to_yume',
+    'verify_turnstile': '.helpers',
+    'get_anilist_user_info': '.helpers',
+    'sync_anilist_watchlist_blocking': '.helpers',
+    'store_sync_progress': '.helpers',
+    'get_sync_progress': '.helpers',
+    'clear_sync_progress': '.helpers',
+    'enrich_watchlist_item': '.helpers',
+}
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(importlib.import_module(module, __package__), name)
+    globals()[name] = value
+    return value
+
 
-# Import from helpers
-from .helpers import (
-    verify_turnstile,
-    get_anilist_user_info,
-    sync_anilist_watchlist_blocking,
-    store_sync_progress,
-    get_sync_progress,
-    clear_sync_progress,
-    enrich_watchlist_item,
-)
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,22 +1,236 @@
+import base64
+import functools
+import hashlib
 import inspect
+import json
 import aiohttp
 import asyncio
+import orjson
+import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional, Callable
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import logging
 from dataclasses import dataclass
 import time
+from pymongo import UpdateOne
 
 logger = logging.getLogger(__name__)
 
 from ..models.user import get_user_by_id
-from ..models.watchlist import (
-    get_user_watchlist, watchlist_collection
-)
+from ..providers.http_session import get_session
+from ..models.watchlist import watchlist_collection
 
 ANILIST_GRAPHQL = "https://graphql.anilist.co"
+ANILIST_TIMEOUT = aiohttp.ClientTimeout(total=45, connect=10)
+# AniList allows ~90 requests/minute, far below what concurrent_requests is sized for
+ANILIST_MAX_CONCURRENCY = 10
 
-@dataclass
+_VIEWER_QUERY = "query { Viewer { id } }"
+_VIEWER_BODY = orjson.dumps({"query": _VIEWER_QUERY, "variables": {}})
+
+# Only the fields the merge reads: large lists are several MB otherwise, parsed and held in full
+_WATCHLIST_QUERY = """
+query ($userId:Int, $chunk:Int, $perChunk:Int) {
+  MediaListCollection(userId: $userId, type: ANIME, chunk: $chunk, perChunk: $perChunk) {
+    hasNextChunk
+    lists {
+      entries {
+        status
+        progress
+        media {
+          id
+          title { romaji english userPreferred }
+        }
+      }
+    }
+  }
+}
+"""
+# The query text is encoded once; each chunk request only serializes its small variables object
+_WATCHLIST_BODY_PREFIX = b'{"query":' + orjson.dumps(_WATCHLIST_QUERY) + b',"variables":'
+
+# AniList list status -> local watchlist status; anything else (incl. REPEATING) counts as watching
+_STATUS_MAP = {
+    'CURRENT': 'watching', 'COMPLETED': 'completed',
+    'PAUSED': 'paused', 'DROPPED': 'dropped',
+    'PLANNING': 'plan_to_watch',
+}
+
+# Short-lived in-process LRU cache so back-to-back syncs don't resolve the viewer again.
+# The list itself is never cached: a sync is always user-triggered and must see their latest edits.
+VIEWER_CACHE_TTL = 3600
+VIEWER_CACHE_MAX = 1024
+_viewer_cache: "OrderedDict[str, tuple]" = OrderedDict()  # sha256(token) -> (viewer_id, stored_at)
+
+
+def _cache_get(cache: OrderedDict, key, ttl: int):
+    hit = cache.get(key)
+    if not hit:
+        return None
+    try:
+        if time.monotonic() - hit[1] >= ttl:
+            del cache[key]
+            return None
+        cache.move_to_end(key)
+    except KeyError:
+        pass  # only when a sync runs off the shared sync loop, on another thread
+    return hit[0]
+
+
+def _cache_put(cache: OrderedDict, key, value, max_size: int) -> None:
+    cache[key] = (value, time.monotonic())
+    cache.move_to_end(key)
+    while len(cache) > max_size:
+        try:
+            cache.popitem(last=False)
+        except KeyError:
+            break
+
+class _TokenBucket:
+    """
+    Token bucket shared by every sync in the process. Syncs normally run on the
+    shared sync loop (helpers._get_sync_loop), but slots are still reserved under
+    a thread lock so a sync driven from another thread's loop stays within budget.
+    Waits use asyncio.sleep.
+    """
+
+    def __init__(self, rate: int, period: float):
+        self.capacity = rate
+        self.tokens = float(rate)
+        self.refill_rate = rate / period
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_rate)
+            self.updated = now
+            # Going negative queues the caller behind earlier reservations
+            self.tokens -= 1
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.refill_rate
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every reservation for `seconds`, e.g. after a 429."""
+        with self._lock:
+            # Overlapping 429s reporting the same window do not stack
+            self.tokens = min(self.tokens, -seconds * self.refill_rate)
+
+    def observe(self, remaining: int) -> None:
+        """Align with the server's count so other clients' usage of the same budget is respected."""
+        with self._lock:
+            self.tokens = min(self.tokens, float(remaining))
+
+    async def acquire(self) -> None:
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+# AniList allows 90 requests/minute; stay just under it across every sync in the process
+_anilist_bucket = _TokenBucket(rate=88, period=60)
+
+
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+# Longest server-requested pause honoured. The bucket is shared by every sync in the
+# process, so a larger (or malformed) Retry-After fails this request instead of stalling all
+MAX_RATE_LIMIT_PAUSE = BACKOFF_CAP * 2
+
+
+def _backoff(retry_count: int) -> float:
+    """Capped exponential backoff with jitter so throttled requests don't retry in lockstep."""
+    return min(BACKOFF_CAP, BACKOFF_BASE * 2 ** retry_count) * (0.5 + random.random() * 0.5)
+
+
+def _retry_after(resp: aiohttp.ClientResponse, default: float) -> float:
+    """
+    Seconds to wait from Retry-After (delta-seconds or HTTP-date), else from
+    X-RateLimit-Reset (epoch seconds), else `default`.
+    """
+    value = resp.headers.get("Retry-After")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            retry_at = None
+        if retry_at is not None:
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=timezone.utc)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    reset = resp.headers.get("X-RateLimit-Reset")
+    if reset:
+        try:
+            return max(0.0, float(reset) - time.time())
+        except ValueError:
+            pass
+    return default
+
+
+def _observe_rate_limit(resp: aiohttp.ClientResponse) -> None:
+    remaining = resp.headers.get("X-RateLimit-Remaining")
+    if remaining is not None:
+        try:
+            _anilist_bucket.observe(int(remaining))
+        except ValueError:
+            pass
+
+class AdmissionGate:
+    """
+    Concurrency limit whose ceiling can move while requests are in flight,
+    which asyncio.Semaphore doesn't support. A 429 shrinks it by one slot;
+    every RAMP_UP_AFTER consecutive successes give one back, up to the initial size.
+    """
+    RAMP_UP_AFTER = 10
+
+    def __init__(self, max_active: int):
+        self.limit = max(1, max_active)
+        self.max_active = self.limit
+        self.active = 0
+        self._successes = 0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.max_active)
+            self.active += 1
+
+    async def release(self) -> None:
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify(1)
+
+    async def set_max(self, n: int) -> None:
+        n = min(self.limit, max(1, n))
+        async with self._cond:
+            grew = n > self.max_active
+            self.max_active = n
+            self._successes = 0
+            if grew:
+                self._cond.notify_all()
+
+    async def record_success(self) -> None:
+        if self.max_active >= self.limit:
+            return
+        self._successes += 1
+        if self._successes >= self.RAMP_UP_AFTER:
+            await self.set_max(self.max_active + 1)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.release()
+
+@dataclass(slots=True)
 class BatchConfig:
     batch_size: int = 200
     concurrent_requests: int = 50
@@ -27,6 +241,12 @@ class BatchConfig:
     max_anime_check: int = 5
 
 class SyncProgress:
+    # update() publishes at most this often, plus once when the last entry lands
+    REPORT_INTERVAL = 0.5
+
+    __slots__ = ("total", "processed", "synced", "failed", "cached_hits", "skipped",
+                 "callback", "_cb_is_coro", "start_time", "_last_report")
+
     def __init__(self, total: int, callback: Optional[Callable] = None):
         self.total = total
         self.processed = 0
@@ -35,29 +255,35 @@ class SyncProgress:
         self.cached_hits = 0
         self.skipped = 0
         self.callback = callback
-        self.start_time = time.time()
-        self._lock = asyncio.Lock()
+        self._cb_is_coro = bool(callback) and inspect.iscoroutinefunction(callback)
+        self.start_time = time.monotonic()
+        self._last_report = 0.0
     
     async def update(self, synced: bool = False, failed: bool = False, cached: bool = False, skipped: bool = False):
-        async with self._lock:
-            self.processed += 1
-            if synced:
-                self.synced += 1
-            if failed:
-                self.failed += 1
-            if cached:
-                self.cached_hits += 1
-            if skipped:
-                self.skipped += 1
-            
-            if self.callback and (self.processed % 5 == 0 or self.processed == self.total):
-                try:
-                    if inspect.iscoroutinefunction(self.callback):
-                        await self.callback(self)
-                    else:
-                        self.callback(self)
-                except Exception as e:
-                    logger.warning(f"Progress callback error: {e}")
+        # Counters are bumped without an await in between, so on a single event loop
+        # no other coroutine can interleave here and no lock is needed
+        self.processed += 1
+        if synced:
+            self.synced += 1
+        if failed:
+            self.failed += 1
+        if cached:
+            self.cached_hits += 1
+        if skipped:
+            self.skipped += 1
+        
+        if not self.callback:
+            return
+        now = time.monotonic()
+        if self.processed == self.total or now - self._last_report >= self.REPORT_INTERVAL:
+            self._last_report = now
+            try:
+                if self._cb_is_coro:
+                    await self.callback(self)
+                else:
+                    self.callback(self)
+            except Exception as e:
+                logger.warning("Progress callback error: %s", e)
 
     @property
     def percentage(self) -> float:
@@ -65,132 +291,196 @@ class SyncProgress:
     
     @property
     def elapsed_time(self) -> float:
-        return time.time() - self.start_time
+        return time.monotonic() - self.start_time
     
     @property
     def estimated_remaining(self) -> float:
         if self.processed == 0:
             return 0
-        rate = self.processed / self.elapsed_time
-        remaining = self.total - self.processed
-        return remaining / rate if rate > 0 else 0
+        # remaining / (processed / elapsed), with the clock read once and no zero-rate case
+        return (self.total - self.processed) * self.elapsed_time / self.processed
+
+@dataclass(slots=True)
+class _PhaseSnapshot:
+    """Progress shape handed to the callback for phase messages outside the entry loop."""
+    message: str
+    processed: int = 0
+    total: int = 0
+    percentage: float = 0
+    synced: int = 0
+    skipped: int = 0
+    failed: int = 0
+    cached_hits: int = 0
 
-async def _fetch_graphql(session: aiohttp.ClientSession, access_token: str, query: str, variables: Optional[dict] = None, retry_count: int = 0) -> Optional[dict]:
+# Retries allowed per failure kind; anything else (4xx other than 429) is returned at once
+_RETRY_LIMITS = {"rate_limited": 3, "server": 3, "timeout": 3, "network": 2}
+
+async def _fetch_graphql(session: aiohttp.ClientSession, access_token: str, query: str, variables: Optional[dict] = None,
+                         gate: Optional[AdmissionGate] = None, body: Optional[bytes] = None) -> Optional[dict]:
+    # Serialized once per logical request; retries resend the same bytes
+    if body is None:
+        body = orjson.dumps({"query": query, "variables": variables or {}})
+    if gate is None:
+        return await _post_graphql(session, access_token, body, None)
+    # One slot per logical request; retries (and their backoff) keep the slot
+    async with gate:
+        return await _post_graphql(session, access_token, body, gate)
+
+async def _post_graphql(session: aiohttp.ClientSession, access_token: str, body: bytes,
+                        gate: Optional[AdmissionGate]) -> dict:
     headers = {
         "Authorization": f"Bearer {access_token}",
         "Content-Type": "application/json",
         "Accept": "application/json",
     }
-    payload = {"query": query, "variables": variables or {}}
     
-    try:
-        async with session.post(ANILIST_GRAPHQL, json=payload, headers=headers) as resp:
-            if resp.status == 429:  # Rate limited
-                if retry_count < 3:
-                    wait_time = (2 ** retry_count) * 2
-                    logger.info(f"Rate limited (429), waiting {wait_time}s before retry")
-                    await asyncio.sleep(wait_time)
-                    return await _fetch_graphql(session, access_token, query, variables, retry_count + 1)
-                else:
-                    logger.warning("Rate limited, max retries exceeded")
-                    return {"error": "rate_limited"}
-            
-            if resp.status != 200:
-                text = await resp.text()
-                if resp.status >= 500 and retry_count < 3:
-                    wait_time = (2 ** retry_count)
-                    await asyncio.sleep(wait_time)
-                    return await _fetch_graphql(session, access_token, query, variables, retry_count + 1)
+    attempt = 0
+    while True:
+        try:
+            await _anilist_bucket.acquire()
+            async with session.post(ANILIST_GRAPHQL, data=body, headers=headers, timeout=ANILIST_TIMEOUT) as resp:
+                _observe_rate_limit(resp)
+                if resp.status == 200:
+                    if gate is not None:
+                        await gate.record_success()
+                    return orjson.loads(await resp.read())
                 
-                logger.warning(f"AniList API error {resp.status}: {text[:200]}")
-                return {"error": f"status:{resp.status}", "body": text}
-            
-            return await resp.json()
-    except asyncio.TimeoutError:
-        if retry_count < 3:
-            await asyncio.sleep(2 ** retry_count)
-            return await _fetch_graphql(session, access_token, query, variables, retry_count + 1)
-        return {"error": "timeout"}
-    except Exception as e:
-        if retry_count < 2: 
-            await asyncio.sleep(1)
-            return await _fetch_graphql(session, access_token, query, variables, retry_count + 1)
-        logger.warning(f"AniList API error: {e}")
-        return {"error": str(e)}
+                if resp.status == 429:  # Rate limited
+                    if gate is not None:
+                        await gate.set_max(gate.max_active - 1)
+                    if attempt >= _RETRY_LIMITS["rate_limited"]:
+                        logger.warning("Rate limited, max retries exceeded")
+                        return {"error": "rate_limited"}
+                    pause = _retry_after(resp, _backoff(attempt))
+                    if pause > MAX_RATE_LIMIT_PAUSE:
+                        logger.warning("Rate limited, AniList asked for %.0fs, more than a sync can wait", pause)
+                        _anilist_bucket.pause(MAX_RATE_LIMIT_PAUSE)
+                        return {"error": "rate_limited"}
+                    logger.info("Rate limited (429), pausing AniList requests for %.1fs", pause)
+                    # Every caller waits out the pause in the shared bucket, this retry included
+                    _anilist_bucket.pause(pause)
+                    wait_time = 0
+                else:
+                    text = await resp.text()
+                    if resp.status < 500 or attempt >= _RETRY_LIMITS["server"]:
+                        logger.warning("AniList API error %s: %s", resp.status, text[:200])
+                        return {"error": f"status:{resp.status}", "body": text}
+                    wait_time = _backoff(attempt)
+        except asyncio.TimeoutError:
+            if attempt >= _RETRY_LIMITS["timeout"]:
+                return {"error": "timeout"}
+            wait_time = _backoff(attempt)
+        except Exception as e:
+            if attempt >= _RETRY_LIMITS["network"]:
+                logger.warning("AniList API error: %s", e)
+                return {"error": str(e)}
+            wait_time = _backoff(attempt)
+        
+        # The response is released before backing off
+        if wait_time:
+            await asyncio.sleep(wait_time)
+        attempt += 1
 
-async def fetch_anilist_viewer_id(session: aiohttp.ClientSession, access_token: str) -> Optional[int]:
-    query = "query { Viewer { id } }"
-    r = await _fetch_graphql(session, access_token, query)
+async def fetch_anilist_viewer_id(session: aiohttp.ClientSession, access_token: str,
+                                  gate: Optional[AdmissionGate] = None) -> Optional[int]:
+    token_key = hashlib.sha256(access_token.encode()).hexdigest()
+    cached = _cache_get(_viewer_cache, token_key, VIEWER_CACHE_TTL)
+    if cached:
+        return cached
+    r = await _fetch_graphql(session, access_token, _VIEWER_QUERY, gate=gate, body=_VIEWER_BODY)
     if not r or "data" not in r or "error" in r:
         return None
-    return r["data"]["Viewer"]["id"]
-
-async def fetch_anilist_watchlist(session: aiohttp.ClientSession, access_token: str) -> List[Dict[str, Any]]:
-    query = """
-    query ($userId:Int) {
-      MediaListCollection(userId: $userId, type: ANIME) {
-        lists {
-          name
-          entries {
-            id
-            status
-            progress
-            score
-            media {
-              id
-              idMal
-              episodes
-              siteUrl
-              title { romaji english native userPreferred }
-              synonyms
-            }
-          }
-        }
-      }
-    }
+    viewer_id = r["data"]["Viewer"]["id"]
+    _cache_put(_viewer_cache, token_key, viewer_id, VIEWER_CACHE_MAX)
+    return viewer_id
+
+def _viewer_id_from_token(access_token: str) -> Optional[int]:
+    """
+    AniList access tokens are JWTs whose `sub` claim is the viewer's user id.
+    Reading it locally saves the Viewer round-trip before the list query;
+    AniList still authorizes the list request with the token itself.
     """
-    viewer_id = await fetch_anilist_viewer_id(session, access_token)
+    try:
+        payload = access_token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        return int(claims["sub"])
+    except Exception:
+        return None
+
+# AniList caps perChunk at 500; lists past the first chunk are fetched a few chunks at a time
+WATCHLIST_CHUNK_SIZE = 500
+WATCHLIST_CHUNK_WAVE = 4
+
+def _collect_list_entries(media_collection: Dict[str, Any], out: List[Dict[str, Any]]) -> None:
+    # Entries are kept as decoded; the query already limits them to status, progress and media
+    for lst in media_collection.get("lists", []) or []:
+        out.extend(e for e in lst.get("entries") or [] if e.get("media"))
+
+async def fetch_anilist_watchlist(session: aiohttp.ClientSession, access_token: str,
+                                  gate: Optional[AdmissionGate] = None) -> List[Dict[str, Any]]:
+    viewer_id = _viewer_id_from_token(access_token)
+    if not viewer_id:
+        viewer_id = await fetch_anilist_viewer_id(session, access_token, gate)
     if not viewer_id:
         logger.error("Could not fetch viewer ID from AniList")
         return []
     
-    r = await _fetch_graphql(session, access_token, query, {"userId": viewer_id})
-    
-    if not r or "error" in r or "data" not in r:
-        logger.error(f"AniList API error or no data: {r}")
-        return []
-    
-    media_collection = r["data"].get("MediaListCollection")
-    if not media_collection:
-        return []
+    async def fetch_chunk(chunk: int) -> Optional[Dict[str, Any]]:
+        variables = {"userId": viewer_id, "chunk": chunk, "perChunk": WATCHLIST_CHUNK_SIZE}
+        body = _WATCHLIST_BODY_PREFIX + orjson.dumps(variables) + b"}"
+        r = await _fetch_graphql(session, access_token, _WATCHLIST_QUERY, variables, gate=gate, body=body)
+        if not r or "error" in r or "data" not in r:
+            logger.error("AniList API error or no data (chunk %s): %s", chunk, r)
+            return None
+        return r["data"].get("MediaListCollection") or {}
     
-    lists = media_collection.get("lists", [])
     out = []
+    first = await fetch_chunk(1)
+    if not first:
+        return []
+    _collect_list_entries(first, out)
     
-    for lst in lists:
-        list_name = lst.get("name", "Unknown")
-        entries = lst.get("entries", [])
-        for e in entries:
-            if not e.get("media"):
-                continue
-            out.append({
-                "list_name": list_name,
-                "entry_id": e.get("id"),
-                "status": e.get("status"),
-                "progress": e.get("progress", 0),
-                "score": e.get("score"),
-                "media": e.get("media")
-            })
+    # Most lists fit in one chunk; bigger ones fetch the following chunks concurrently
+    next_chunk = 2
+    has_next = first.get("hasNextChunk")
+    while has_next:
+        wave = await asyncio.gather(*[
+            fetch_chunk(c) for c in range(next_chunk, next_chunk + WATCHLIST_CHUNK_WAVE)
+        ])
+        if any(collection is None for collection in wave):
+            return []
+        for collection in wave:
+            _collect_list_entries(collection, out)
+        next_chunk += WATCHLIST_CHUNK_WAVE
+        has_next = wave[-1].get("hasNextChunk")
     
     return out
 
+def _entry_title(media: Dict[str, Any]) -> str:
+    title = media.get("title") or {}
+    return title.get("userPreferred") or title.get("english") or title.get("romaji") or ""
+
+# pymongo calls get their own small pool instead of the loop's default executor, which syncs on
+# the shared loop (and the threaded DNS resolver) would otherwise contend for
+MONGO_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="anilist-mongo")
+
+def _run_blocking(func: Callable, *args, **kwargs):
+    return asyncio.get_running_loop().run_in_executor(
+        MONGO_EXECUTOR, functools.partial(func, *args, **kwargs)
+    )
+
+@functools.lru_cache(maxsize=128)
+def _is_coroutine_function(func: Callable) -> bool:
+    return inspect.iscoroutinefunction(func)
+
 async def call_maybe_async(func: Callable, *args, **kwargs) -> Any:
     try:
-        if inspect.iscoroutinefunction(func):
+        if _is_coroutine_function(func):
             return await func(*args, **kwargs)
-        return func(*args, **kwargs)
+        return await _run_blocking(func, *args, **kwargs)
     except Exception as e:
-        logger.warning(f"call_maybe_async error: {e}")
+        logger.warning("call_maybe_async error: %s", e)
         return None
 
 async def sync_anilist_watchlist_to_local(user_id: str, access_token: str, 
@@ -198,30 +488,28 @@ async def sync_anilist_watchlist_to_local(user_id: str, access_token: str,
     if config is None:
         config = BatchConfig()
     
-    timeout = aiohttp.ClientTimeout(total=45, connect=10)
-    connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
-    session = aiohttp.ClientSession(timeout=timeout, connector=connector)
+    # Shared with the providers' AniList calls on this loop; closed when the loop shuts down.
+    # A sync sends at most a few concurrent requests (one chunk wave, paced by the token
+    # bucket), so HTTP/2 multiplexing would save little over these keep-alive connections.
+    session = await get_session(ANILIST_GRAPHQL)
+    # AniList-only gate: the Mongo reads and writes run on worker threads outside it. It keeps the
+    # sync within AniList's budget, and narrows further while AniList answers with 429s
+    gate = AdmissionGate(min(config.concurrent_requests, ANILIST_MAX_CONCURRENCY))
     
     try:
         user = await call_maybe_async(get_user_by_id, user_id)
         if not user:
             return {"error": "User not found"}
 
-        logger.info(f"Starting AniList sync for user {user_id}")
+        logger.info("Starting AniList sync for user %s", user_id)
         
         def _send_phase(message, processed=0, total=0, pct=0, **extra):
             if progress_callback:
-                class _P:
-                    pass
-                p = _P()
-                p.processed = processed
-                p.total = total
-                p.synced = extra.get("synced", 0)
-                p.skipped = extra.get("skipped", 0)
-                p.failed = extra.get("failed", 0)
-                p.percentage = pct
-                p.message = message
-                p.cached_hits = extra.get("cached_hits", 0)
+                p = _PhaseSnapshot(
+                    message=message, processed=processed, total=total, percentage=pct,
+                    synced=extra.get("synced", 0), skipped=extra.get("skipped", 0),
+                    failed=extra.get("failed", 0), cached_hits=extra.get("cached_hits", 0),
+                )
                 try:
                     progress_callback(p)
                 except Exception:
@@ -229,10 +517,24 @@ async def sync_anilist_watchlist_to_local(user_id: str, access_token: str,
         
         _send_phase("Fetching your AniList watchlist...", pct=10)
         
-        watchlist = await fetch_anilist_watchlist(session, access_token)
+        # The stored list is independent of the AniList fetch, so it is read on a worker thread
+        # while the request is in flight. It is a narrow projection, enough to diff and to
+        # fall back on stored titles.
+        watchlist, doc = await asyncio.gather(
+            fetch_anilist_watchlist(session, access_token, gate),
+            _run_blocking(
+                watchlist_collection.find_one,
+                {"_id": user_id},
+                {"watchlist.anime_id": 1, "watchlist.anime_title": 1,
+                 "watchlist.status": 1, "watchlist.watched_episodes": 1},
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(watchlist, BaseException):
+            raise watchlist
         
         if not watchlist:
-            viewer_id = await fetch_anilist_viewer_id(session, access_token)
+            viewer_id = await fetch_anilist_viewer_id(session, access_token, gate)
             if viewer_id:
                  return {
                     "error": "AniList watchlist is empty or private.",
@@ -245,61 +547,80 @@ async def sync_anilist_watchlist_to_local(user_id: str, access_token: str,
         
         _send_phase(f"Found {total} anime on AniList. Updating local watchlist...", total=total, pct=40)
         
-        # Pre-fetch user's existing watchlist
-        existing_map = {}
-        try:
-            user_watchlist = await call_maybe_async(get_user_watchlist, user_id)
-            if user_watchlist:
-                for wl_entry in user_watchlist:
-                    aid = wl_entry.get("anime_id")
-                    if aid:
-                        existing_map[aid] = wl_entry
-        except Exception as e:
-             logger.warning("Failed to pre-fetch watchlist: %s", e)
-             
-        status_mapping = {
-            'CURRENT': 'watching', 'COMPLETED': 'completed',
-            'PAUSED': 'paused', 'DROPPED': 'dropped',
-            'PLANNING': 'plan_to_watch'
-        }
-        
-        now = datetime.utcnow()
-        updates_count = 0
+        if isinstance(doc, BaseException):
+            logger.error("Watchlist read failed: %s", doc)
+            return {"error": f"Database read failed: {doc}"}
         
-        for entry in watchlist:
-            media = entry.get("media", {})
-            anilist_id = media.get("id")
-            if not anilist_id:
-                continue
-                
-            anime_id = str(anilist_id)
-            title = media.get("title", {}).get("userPreferred") or media.get("title", {}).get("english") or media.get("title", {}).get("romaji", "Unknown")
-            local_status = status_mapping.get(entry.get("status", "CURRENT"), "watching")
-            watched_episodes = entry.get("progress", 0)
-            
-            existing_entry = existing_map.get(anime_id, {})
-            existing_map[anime_id] = {
-                "anime_id": anime_id,
-                "anime_title": title or existing_entry.get("anime_title", ""),
-                "status": local_status,
-                "watched_episodes": watched_episodes,
+        now = datetime.now(timezone.utc)
+        # Keyed by anime_id: an anime can sit in several AniList custom lists.
+        # Built in one comprehension; empty titles fall back to the stored ones below.
+        incoming = {
+            str(media["id"]): {
+                "anime_id": str(media["id"]),
+                "anime_title": _entry_title(media),
+                "status": _STATUS_MAP.get(entry.get("status")) or "watching",
+                "watched_episodes": entry.get("progress") or 0,
                 "updated_at": now,
             }
-            updates_count += 1
-            
-        merged_watchlist = list(existing_map.values())
+            for entry in watchlist
+            if (media := entry.get("media")) and media.get("id")
+        }
+        updates_count = len(incoming)
         
         _send_phase(f"Saving {updates_count} anime to your YumeZone watchlist...", total=total, pct=80)
         
+        # Only write what changed: existing entries are patched in place (keeping their
+        # playback progress fields), new ones are pushed in one go.
         try:
-            watchlist_collection.update_one(
-                {"_id": user_id},
-                {
-                    "$set": {"watchlist": merged_watchlist},
-                    "$setOnInsert": {"created_at": now},
-                },
-                upsert=True,
-            )
+            stored = {w.get("anime_id"): w for w in (doc or {}).get("watchlist", [])}
+            
+            operations = []
+            new_entries = []
+            for anime_id, item in incoming.items():
+                current = stored.get(anime_id)
+                if current is None:
+                    new_entries.append(item)
+                    continue
+                item["anime_title"] = item["anime_title"] or current.get("anime_title", "")
+                if (
+                    (current.get("anime_title"), current.get("status"), current.get("watched_episodes"))
+                    != (item["anime_title"], item["status"], item["watched_episodes"])
+                ):
+                    operations.append(UpdateOne(
+                        {"_id": user_id},
+                        {"$set": {
+                            "watchlist.$[el].anime_title": item["anime_title"],
+                            "watchlist.$[el].status": item["status"],
+                            "watchlist.$[el].watched_episodes": item["watched_episodes"],
+                            "watchlist.$[el].updated_at": now,
+                        }},
+                        array_filters=[{"el.anime_id": anime_id}],
+                    ))
+            if new_entries or doc is None:
+                operations.append(UpdateOne(
+                    {"_id": user_id},
+                    {"$push": {"watchlist": {"$each": new_entries}}, "$setOnInsert": {"created_at": now}},
+                    upsert=True,
+                ))
+            if not operations:
+                # Diffed against the stored list rather than a remembered payload hash, so a
+                # stored copy that drifted from AniList is repaired on the next sync
+                logger.info("AniList watchlist unchanged for user %s, skipping write", user_id)
+                return {
+                    "synced_count": 0,
+                    "skipped_count": total,
+                    "failed_count": 0,
+                    "total_count": total,
+                    "cached_hits": 0,
+                    "unchanged": True,
+                    "success_rate": "100.0%",
+                    "elapsed_time": f"{progress.elapsed_time:.1f}s"
+                }
+            # pymongo blocks, so batches run on a worker thread and the loop stays free
+            for start in range(0, len(operations), config.batch_size):
+                await _run_blocking(
+                    watchlist_collection.bulk_write, operations[start:start + config.batch_size], ordered=False
+                )
             progress.synced = updates_count
             progress.processed = updates_count
             
@@ -309,7 +630,7 @@ async def sync_anilist_watchlist_to_local(user_id: str, access_token: str,
 
         success_rate = 100.0 if watchlist else 0
 
-        logger.info(f"Sync completed for user {user_id}: {updates_count} synced")
+        logger.info("Sync completed for user %s: %s synced", user_id, updates_count)
         
         return {
             "synced_count": updates_count,
@@ -322,8 +643,5 @@ async def sync_anilist_watchlist_to_local(user_id: str, access_token: str,
         }
     
     except Exception as e:
-        logger.exception(f"Sync failed: {e}")
+        logger.exception("Sync failed: %s", e)
         return {"error": str(e)}
-    finally:
-        if not session.closed:
-            await session.close()
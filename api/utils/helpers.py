@@ -4,19 +4,33 @@ Includes Turnstile verification, AniList API interactions, and watchlist enrichm
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import logging
+import orjson
 import time
 import asyncio
+import concurrent.futures
+import functools
 import inspect
-import aiohttp
-from threading import Lock
+import atexit
+from http.cookiejar import DefaultCookiePolicy
+from threading import Lock, Thread
 from typing import Dict, Any
 
+from ..providers.http_session import get_session
+
 logger = logging.getLogger(__name__)
 
-# Global storage for sync progress
+# Global storage for sync progress. Entries are replaced wholesale, never mutated, and
+# single-key dict get/set/pop are atomic under the GIL, so no lock is needed
 sync_progress_storage = {}
-sync_progress_lock = Lock()
+
+
+# Keep-alive pool for the blocking Turnstile/AniList calls, so repeat calls skip the TLS handshake.
+# It is shared by every user, so it must not carry cookies from one user's call into the next
+_http = requests.Session()
+_http.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+_http.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
 
 
 # === Turnstile Verification ===
@@ -38,7 +52,7 @@ def verify_turnstile(token, secret, remoteip=None):
     
     try:
         # Use longer timeout for serverless functions
-        resp = requests.post(
+        resp = _http.post(
             "https://challenges.cloudflare.com/turnstile/v0/siteverify", 
             data=data, 
             timeout=10,
@@ -49,7 +63,7 @@ def verify_turnstile(token, secret, remoteip=None):
         )
         
         if resp.status_code != 200:
-            logger.error(f"Turnstile API returned status {resp.status_code}: {resp.text}")
+            logger.error("Turnstile API returned status %s: %s", resp.status_code, resp.text)
             return False
             
         result = resp.json()
@@ -58,7 +72,7 @@ def verify_turnstile(token, secret, remoteip=None):
         # Log detailed error info for debugging
         if not success:
             error_codes = result.get("error-codes", [])
-            logger.warning(f"Turnstile verification failed. Token: {token[:20]}..., Error codes: {error_codes}")
+            logger.warning("Turnstile verification failed. Token: %s..., Error codes: %s", token[:20], error_codes)
             
             # For Vercel, sometimes we get false negatives due to IP/timing issues
             # If it's just a timeout or connection issue, we might want to be more lenient
@@ -73,39 +87,42 @@ def verify_turnstile(token, secret, remoteip=None):
         # For Vercel, timeout might be due to serverless cold start - be more lenient
         return True
     except requests.exceptions.RequestException as e:
-        logger.error(f"Turnstile verification request error: {e}")
+        logger.error("Turnstile verification request error: %s", e)
         return False
     except Exception as e:
-        logger.error(f"Turnstile verification unexpected error: {e}")
+        logger.error("Turnstile verification unexpected error: %s", e)
         return False
 
 
 # === AniList API Functions ===
 
-def get_anilist_user_info(access_token):
-    """Get user information from AniList GraphQL API."""
-    query = '''
-    query {
-        Viewer {
-            id
-            name
-            avatar {
-                large
-                medium
-            }
-            bannerImage
-            about
-            statistics {
-                anime {
-                    count
-                    meanScore
-                    minutesWatched
-                }
+_USER_INFO_QUERY = '''
+query {
+    Viewer {
+        id
+        name
+        avatar {
+            large
+            medium
+        }
+        bannerImage
+        about
+        statistics {
+            anime {
+                count
+                meanScore
+                minutesWatched
             }
         }
     }
-    '''
-    
+}
+'''
+# The query never changes, so its request body is encoded once
+_USER_INFO_BODY = orjson.dumps({'query': _USER_INFO_QUERY})
+
+
+def get_anilist_user_info(access_token):
+    """Get user information from AniList GraphQL API."""
     headers = {
         'Authorization': f'Bearer {access_token}',
         'Content-Type': 'application/json',
@@ -113,144 +130,202 @@ def get_anilist_user_info(access_token):
     }
     
     try:
-        response = requests.post('https://graphql.anilist.co', 
-                               json={'query': query}, 
-                               headers=headers)
+        response = _http.post('https://graphql.anilist.co', 
+                               data=_USER_INFO_BODY, 
+                               headers=headers,
+                               timeout=10)
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             if 'errors' in data:
-                logger.error(f"AniList GraphQL errors: {data['errors']}")
+                logger.error("AniList GraphQL errors: %s", data['errors'])
                 return None
             return data['data']['Viewer']
         else:
-            logger.error(f"AniList API error: {response.status_code} - {response.text}")
+            logger.error("AniList API error: %s - %s", response.status_code, response.text)
             return None
             
     except Exception as e:
-        logger.error(f"Error getting AniList user info: {e}")
+        logger.error("Error getting AniList user info: %s", e)
         return None
 
+
+_NEXT_EPISODE_BY_ID_QUERY = '''
+query ($id: Int, $idMal: Int) {
+  Media(id: $id, idMal: $idMal, type: ANIME) {
+    nextAiringEpisode {
+      airingAt
+      timeUntilAiring
+      episode
+    }
+  }
+}
+'''
+
+_NEXT_EPISODE_SEARCH_QUERY = '''
+query ($search: String) {
+  Media(search: $search, type: ANIME, status: RELEASING) {
+    nextAiringEpisode {
+      airingAt
+      timeUntilAiring
+      episode
+    }
+  }
+}
+'''
+
+# Pre-encoded up to the variables object, which is spliced in per call
+_NEXT_EPISODE_BY_ID_PREFIX = b'{"query":' + orjson.dumps(_NEXT_EPISODE_BY_ID_QUERY) + b',"variables":'
+_NEXT_EPISODE_SEARCH_PREFIX = b'{"query":' + orjson.dumps(_NEXT_EPISODE_SEARCH_QUERY) + b',"variables":'
+_JSON_HEADERS = {'Content-Type': 'application/json', 'Accept': 'application/json'}
+
+
 async def fetch_anilist_next_episode(anilist_id: int = None, mal_id: int = None, search_title: str = None) -> dict:
     """Fetch the next episode schedule from AniList GraphQL API using anilistId, malId, or search title."""
     if not anilist_id and not mal_id and not search_title:
         return {}
         
-    query_id = '''
-    query ($id: Int, $idMal: Int) {
-      Media(id: $id, idMal: $idMal, type: ANIME) {
-        nextAiringEpisode {
-          airingAt
-          timeUntilAiring
-          episode
-        }
-      }
-    }
-    '''
-    
-    query_search = '''
-    query ($search: String) {
-      Media(search: $search, type: ANIME, status: RELEASING) {
-        nextAiringEpisode {
-          airingAt
-          timeUntilAiring
-          episode
-        }
-      }
-    }
-    '''
-    
     queries_to_try = []
     if anilist_id and int(anilist_id) > 0:
-        queries_to_try.append((query_id, {"id": int(anilist_id)}))
+        queries_to_try.append((_NEXT_EPISODE_BY_ID_PREFIX, {"id": int(anilist_id)}))
     if mal_id and int(mal_id) > 0:
-        queries_to_try.append((query_id, {"idMal": int(mal_id)}))
+        queries_to_try.append((_NEXT_EPISODE_BY_ID_PREFIX, {"idMal": int(mal_id)}))
     if search_title:
-        queries_to_try.append((query_search, {"search": search_title}))
+        queries_to_try.append((_NEXT_EPISODE_SEARCH_PREFIX, {"search": search_title}))
         
     if not queries_to_try:
         return {}
     
     try:
-        async with aiohttp.ClientSession() as session:
-            for query, variables in queries_to_try:
-                async with session.post('https://graphql.anilist.co', json={'query': query, 'variables': variables}) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        media_data = data.get('data', {})
-                        # Handle both single Media and Page->media responses
-                        if 'Page' in media_data:
-                            media_list = media_data.get('Page', {}).get('media', [])
-                            media = media_list[0] if media_list else {}
-                        else:
-                            media = media_data.get('Media') or {}
-                            
-                        next_ep = media.get('nextAiringEpisode')
-                        if next_ep and next_ep.get('airingAt'):
-                            return {
-                                "airingTimestamp": next_ep.get('airingAt'),
-                                "timeUntilAiring": next_ep.get('timeUntilAiring'),
-                                "episode": next_ep.get('episode')
-                            }
-                # If we get here, either status != 200 or no valid airingAt was found for this query.
-                # Continue loop to try the next fallback (e.g. mal_id or search_title).
+        # Pooled per host and loop, so the episode/anime pages reuse the providers' AniList connection
+        session = await get_session('https://graphql.anilist.co')
+        for prefix, variables in queries_to_try:
+            body = prefix + orjson.dumps(variables) + b'}'
+            async with session.post('https://graphql.anilist.co', data=body, headers=_JSON_HEADERS) as resp:
+                if resp.status == 200:
+                    data = orjson.loads(await resp.read())
+                    media_data = data.get('data', {})
+                    # Handle both single Media and Page->media responses
+                    if 'Page' in media_data:
+                        media_list = media_data.get('Page', {}).get('media', [])
+                        media = media_list[0] if media_list else {}
+                    else:
+                        media = media_data.get('Media') or {}
+                        
+                    next_ep = media.get('nextAiringEpisode')
+                    if next_ep and next_ep.get('airingAt'):
+                        return {
+                            "airingTimestamp": next_ep.get('airingAt'),
+                            "timeUntilAiring": next_ep.get('timeUntilAiring'),
+                            "episode": next_ep.get('episode')
+                        }
+            # If we get here, either status != 200 or no valid airingAt was found for this query.
+            # Continue loop to try the next fallback (e.g. mal_id or search_title).
         return {}
     except Exception as e:
-        logger.error(f"Error fetching next episode from AniList: {e}")
+        logger.error("Error fetching next episode from AniList: %s", e)
         return {}
 
 # === Sync Progress Management ===
 
 def store_sync_progress(user_id: str, progress_data: dict):
     """Store sync progress for a user"""
-    with sync_progress_lock:
-        sync_progress_storage[user_id] = {
-            **progress_data,
-            'timestamp': time.time()
-        }
+    sync_progress_storage[user_id] = {
+        **progress_data,
+        'timestamp': time.time()
+    }
 
 
 def get_sync_progress(user_id: str) -> dict:
     """Get sync progress for a user"""
-    with sync_progress_lock:
-        return sync_progress_storage.get(user_id, {})
+    return sync_progress_storage.get(user_id, {})
 
 
 def clear_sync_progress(user_id: str):
     """Clear sync progress for a user"""
-    with sync_progress_lock:
-        sync_progress_storage.pop(user_id, None)
+    sync_progress_storage.pop(user_id, None)
 
 
 # === Sync Wrapper Function ===
 
+def _new_event_loop() -> asyncio.AbstractEventLoop:
+    """uvloop's libuv-backed loop when it is installed, the stdlib loop otherwise."""
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.new_event_loop()
+    return uvloop.new_event_loop()
+
+
+# Syncs share one long-lived loop so the pooled AniList session (and its DNS
+# cache and keep-alive connections) survives from one sync to the next
+_sync_loop = None
+_sync_loop_lock = Lock()
+# Upper bound on how long a request thread waits for a sync to finish
+SYNC_TIMEOUT = 300
+
+
+def _get_sync_loop() -> asyncio.AbstractEventLoop:
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None or _sync_loop.is_closed():
+            loop = _new_event_loop()
+            Thread(target=loop.run_forever, name="anilist-sync-loop", daemon=True).start()
+            atexit.register(_shutdown_sync_loop, loop)
+            _sync_loop = loop
+        return _sync_loop
+
+
+def _shutdown_sync_loop(loop: asyncio.AbstractEventLoop):
+    """Finalize the loop's async generators, which closes its pooled sessions."""
+    if not loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(loop.shutdown_asyncgens(), loop).result(timeout=5)
+    except Exception:
+        pass
+    loop.call_soon_threadsafe(loop.stop)
+
+
+@functools.lru_cache(maxsize=None)
+def _sync_entrypoint():
+    """
+    Resolve the sync function, its calling convention and the batch config once.
+    Imported lazily so loading helpers doesn't pull in the sync stack.
+    """
+    from .ani_to_yume import sync_anilist_watchlist_to_local as async_sync_watchlist
+    from .ani_to_yume import BatchConfig
+
+    # Use optimized config for better performance and fewer failures; the sync only reads it
+    config = BatchConfig(
+        batch_size=1000,
+        delay_between_batches=0.05,
+        max_retries=1,
+        skip_failed_matches=True,
+        max_search_candidates=4,
+        max_anime_check=3
+    )
+    return (
+        async_sync_watchlist,
+        inspect.iscoroutinefunction(async_sync_watchlist),
+        frozenset(inspect.signature(async_sync_watchlist).parameters),
+        config,
+    )
+
+
 def sync_anilist_watchlist_blocking(user_id: str, access_token: str, progress_callback=None) -> Dict[str, Any]:
     """
     Run the user's sync function in a safe way whether it's async or sync.
     Returns the dict result, or {'error': ...} on failure.
     """
     try:
-        # import the async function and BatchConfig from ani_to_yume
-        from .ani_to_yume import sync_anilist_watchlist_to_local as async_sync_watchlist
-        from .ani_to_yume import BatchConfig
-
-        # Use optimized config for better performance and fewer failures
-        config = BatchConfig(
-            batch_size=1000,
-            delay_between_batches=0.05,
-            max_retries=1,
-            skip_failed_matches=True,
-            max_search_candidates=4,
-            max_anime_check=3
-        )
+        async_sync_watchlist, is_coro, params, config = _sync_entrypoint()
 
         # If the imported name is an async function, call it with progress callback
-        if inspect.iscoroutinefunction(async_sync_watchlist):
+        if is_coro:
             coro = async_sync_watchlist(user_id, access_token, progress_callback, config)
         else:
             # check if function accepts progress_callback and config
-            sig = inspect.signature(async_sync_watchlist)
-            params = sig.parameters
             if 'progress_callback' in params and 'config' in params:
                 coro_or_result = async_sync_watchlist(user_id, access_token, progress_callback, config)
             elif 'progress_callback' in params:
@@ -266,21 +341,14 @@ def sync_anilist_watchlist_blocking(user_id: str, access_token: str, progress_ca
                 return coro_or_result or {}
 
         # At this point `coro` should be an awaitable
+        future = asyncio.run_coroutine_threadsafe(coro, _get_sync_loop())
         try:
-            return asyncio.run(coro) or {}
-        except RuntimeError as e:
-            # asyncio.run may fail if we're already inside an event loop (e.g., some WSGI/ASGI contexts).
-            logger.debug("asyncio.run failed, falling back to manual loop: %s", e)
-            loop = asyncio.new_event_loop()
-            try:
-                asyncio.set_event_loop(loop)
-                return loop.run_until_complete(coro) or {}
-            finally:
-                try:
-                    loop.run_until_complete(loop.shutdown_asyncgens())
-                except Exception:
-                    pass
-                loop.close()
+            return future.result(timeout=SYNC_TIMEOUT) or {}
+        except concurrent.futures.TimeoutError:
+            # Stop the sync so it doesn't keep holding the shared loop after we give up
+            future.cancel()
+            logger.error("Watchlist sync for user %s timed out after %ss", user_id, SYNC_TIMEOUT)
+            return {"error": "Sync timed out"}
 
     except Exception as e:
         logger.exception("Blocking watchlist sync failed")
@@ -289,10 +357,11 @@ def sync_anilist_watchlist_blocking(user_id: str, access_token: str, progress_ca
 
 # === Watchlist Enrichment ===
 
-from ..providers import UnifiedScraper
-
-HA = UnifiedScraper()
-
+@functools.lru_cache(maxsize=None)
+def _scraper():
+    """Built on first enrichment, so importing helpers (e.g. for Turnstile) stays cheap."""
+    from ..providers import UnifiedScraper
+    return UnifiedScraper()
 
 
 async def enrich_watchlist_item(item: dict) -> dict:
@@ -306,9 +375,9 @@ async def enrich_watchlist_item(item: dict) -> dict:
             return item
 
         try:
-            resp = await HA.anime_about(anime_id)
+            resp = await _scraper().anime_about(anime_id)
         except Exception as e:
-            logger.debug(f"Scraper.anime_about failed for {anime_id}: {e}")
+            logger.debug("Scraper.anime_about failed for %s: %s", anime_id, e)
             resp = None
 
         poster_url = ''
@@ -317,37 +386,41 @@ async def enrich_watchlist_item(item: dict) -> dict:
         rating = None
         status = 'Unknown'
 
-        if isinstance(resp, dict):
-            candidate = resp.get('anime', {}).get('info', {})
-
-            if isinstance(candidate, dict):
-                # Poster
-                poster_url = (
-                    candidate.get('poster')
-                    or candidate.get('image')
-                    or candidate.get('thumbnail')
-                    or candidate.get('poster_url')
-                    or ''
-                )
-
-                # Stats → episodes & rating
-                stats = candidate.get('stats') or {}
-                eps_obj = stats.get('episodes') or candidate.get('episodes')
-
-                if isinstance(eps_obj, dict):
-                    episodes['sub'] = int(eps_obj.get('sub') or 0)
-                    episodes['dub'] = int(eps_obj.get('dub') or 0)
-                elif isinstance(eps_obj, (int, float, str)):
-                    try:
-                        episodes['sub'] = int(eps_obj)
-                    except Exception:
-                        pass
-
-                rating = candidate.get('rating') or stats.get('rating')
+        try:
+            anime = resp.get('anime') or {}
+            info = anime.get('info') or {}
+
+            # Poster
+            poster_url = (
+                info.get('poster')
+                or info.get('image')
+                or info.get('thumbnail')
+                or info.get('poster_url')
+                or ''
+            )
+
+            # Stats → episodes & rating
+            stats = info.get('stats') or {}
+            eps_obj = stats.get('episodes') or info.get('episodes')
+            try:
+                episodes['sub'] = int(eps_obj.get('sub') or 0)
+                episodes['dub'] = int(eps_obj.get('dub') or 0)
+            except AttributeError:
+                # A bare count instead of a {'sub', 'dub'} mapping
+                try:
+                    episodes['sub'] = int(eps_obj or 0)
+                except (TypeError, ValueError):
+                    pass
+            except (TypeError, ValueError):
+                pass
+
+            rating = info.get('rating') or stats.get('rating')
 
             # Extract status
-            more_info = resp.get('anime', {}).get('moreInfo', {})
-            status = more_info.get('status') or 'Unknown'
+            status = (anime.get('moreInfo') or {}).get('status') or 'Unknown'
+        except AttributeError:
+            # No usable scraper response (failed call or unexpected shape)
+            pass
 
         # Total episodes
         if episodes.get('sub'):
@@ -367,5 +440,6 @@ async def enrich_watchlist_item(item: dict) -> dict:
         return item
 
     except Exception as e:
-        logger.debug(f"enrich_watchlist_item error for {item.get('anime_id')}: {e}")
+        logger.debug("enrich_watchlist_item error for %s: %s", item.get('anime_id'), e)
         return item
+
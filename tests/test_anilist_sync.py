@@ -0,0 +1,197 @@
+import asyncio
+import copy
+import unittest
+from unittest.mock import patch
+
+from api.utils import ani_to_yume as sync
+
+
+class UpdateOne:
+    def __init__(self, filter, update, upsert=False, array_filters=None):
+        self.filter = filter
+        self.update = update
+        self.upsert = upsert
+        self.array_filters = array_filters or []
+
+
+class MemoryCollection:
+    def __init__(self):
+        self.docs = []
+        self.bulk_ops = []
+
+    def find_one(self, query, projection=None):
+        for doc in self.docs:
+            if self._matches(doc, query):
+                return copy.deepcopy(doc)
+        return None
+
+    def update_one(self, query, update, upsert=False):
+        return self._write(UpdateOne(query, update, upsert=upsert))
+
+    def bulk_write(self, operations, ordered=True):
+        for op in operations:
+            self.bulk_ops.append(op)
+            self._write(op)
+
+    def _write(self, op):
+        for doc in self.docs:
+            if self._matches(doc, op.filter):
+                self._apply(doc, op)
+                return type("UpdateResult", (), {"modified_count": 1})()
+        if op.upsert:
+            doc = dict(op.filter)
+            for key, value in op.update.get("$setOnInsert", {}).items():
+                doc[key] = value
+            self._apply(doc, op)
+            self.docs.append(doc)
+        return type("UpdateResult", (), {"modified_count": 0})()
+
+    def _matches(self, doc, query):
+        return all(doc.get(key) == expected for key, expected in query.items())
+
+    def _apply(self, doc, op):
+        for key, value in op.update.get("$set", {}).items():
+            if ".$[el]." in key:
+                array_key, field = key.split(".$[el].")
+                el_filter = {k.split(".", 1)[1]: v for f in op.array_filters for k, v in f.items()}
+                for item in doc.get(array_key, []):
+                    if self._matches(item, el_filter):
+                        item[field] = value
+            else:
+                doc[key] = value
+        for key, value in op.update.get("$push", {}).items():
+            doc.setdefault(key, []).extend(copy.deepcopy(value["$each"]))
+
+
+def anilist_entry(anime_id, title="", status="CURRENT", progress=0):
+    return {
+        "status": status,
+        "progress": progress,
+        "media": {"id": anime_id, "title": {"userPreferred": title}},
+    }
+
+
+class AnilistSyncMergeTest(unittest.TestCase):
+    def setUp(self):
+        self.watchlist = MemoryCollection()
+        self.anilist = []
+
+        async def fake_get_session(url):
+            return None
+
+        async def fake_fetch(session, access_token, gate=None):
+            return copy.deepcopy(self.anilist)
+
+        for target, value in (
+            ("watchlist_collection", self.watchlist),
+            ("UpdateOne", UpdateOne),
+            ("get_user_by_id", lambda user_id: {"_id": user_id}),
+            ("get_session", fake_get_session),
+            ("fetch_anilist_watchlist", fake_fetch),
+        ):
+            patcher = patch.object(sync, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_sync(self):
+        return asyncio.run(sync.sync_anilist_watchlist_to_local("1", "token"))
+
+    def stored_entries(self):
+        doc = self.watchlist.find_one({"_id": "1"})
+        return {w["anime_id"]: w for w in doc["watchlist"]}
+
+    def seed(self, *entries):
+        self.watchlist.docs.append({"_id": "1", "watchlist": copy.deepcopy(list(entries))})
+
+    def test_new_entries_are_pushed(self):
+        self.seed({"anime_id": "10", "anime_title": "Frieren", "status": "watching", "watched_episodes": 3})
+        self.anilist = [
+            anilist_entry(10, "Frieren", progress=3),
+            anilist_entry(20, "Dandadan", status="PLANNING"),
+        ]
+
+        result = self.run_sync()
+
+        self.assertEqual(result["synced_count"], 2)
+        entries = self.stored_entries()
+        self.assertEqual(set(entries), {"10", "20"})
+        self.assertEqual(entries["20"]["anime_title"], "Dandadan")
+        self.assertEqual(entries["20"]["status"], "plan_to_watch")
+        self.assertEqual(entries["20"]["watched_episodes"], 0)
+
+    def test_changed_entries_are_patched_keeping_extra_fields(self):
+        self.seed({
+            "anime_id": "10", "anime_title": "Frieren", "status": "watching",
+            "watched_episodes": 3, "last_position": 812, "rating": 9,
+        })
+        self.anilist = [anilist_entry(10, "Frieren", status="COMPLETED", progress=28)]
+
+        self.run_sync()
+
+        entry = self.stored_entries()["10"]
+        self.assertEqual(entry["status"], "completed")
+        self.assertEqual(entry["watched_episodes"], 28)
+        self.assertIn("updated_at", entry)
+        self.assertEqual(entry["last_position"], 812)
+        self.assertEqual(entry["rating"], 9)
+
+    def test_unchanged_entries_are_skipped(self):
+        self.seed({"anime_id": "10", "anime_title": "Frieren", "status": "watching", "watched_episodes": 3})
+        self.anilist = [anilist_entry(10, "Frieren", progress=3)]
+
+        result = self.run_sync()
+
+        self.assertTrue(result["unchanged"])
+        self.assertEqual(self.watchlist.bulk_ops, [])
+        self.assertNotIn("updated_at", self.stored_entries()["10"])
+
+    def test_resync_repairs_a_drifted_stored_copy(self):
+        self.anilist = [
+            anilist_entry(10, "Frieren", progress=3),
+            anilist_entry(20, "Dandadan", status="PLANNING"),
+        ]
+        self.run_sync()
+        # The stored copy drifts while AniList stays the same
+        doc = self.watchlist.docs[0]
+        doc["watchlist"] = [w for w in doc["watchlist"] if w["anime_id"] != "20"]
+        doc["watchlist"][0]["status"] = "dropped"
+
+        result = self.run_sync()
+
+        self.assertNotIn("unchanged", result)
+        entries = self.stored_entries()
+        self.assertEqual(set(entries), {"10", "20"})
+        self.assertEqual(entries["10"]["status"], "watching")
+
+    def test_missing_document_is_upserted(self):
+        self.anilist = [anilist_entry(10, "Frieren", progress=3)]
+
+        result = self.run_sync()
+
+        self.assertEqual(result["synced_count"], 1)
+        doc = self.watchlist.find_one({"_id": "1"})
+        self.assertIn("created_at", doc)
+        self.assertEqual([w["anime_id"] for w in doc["watchlist"]], ["10"])
+
+    def test_empty_title_falls_back_to_stored_title(self):
+        self.seed({"anime_id": "10", "anime_title": "Frieren", "status": "watching", "watched_episodes": 3})
+        self.anilist = [anilist_entry(10, "", progress=4)]
+
+        self.run_sync()
+
+        entry = self.stored_entries()["10"]
+        self.assertEqual(entry["anime_title"], "Frieren")
+        self.assertEqual(entry["watched_episodes"], 4)
+
+    def test_empty_title_alone_is_not_a_change(self):
+        self.seed({"anime_id": "10", "anime_title": "Frieren", "status": "watching", "watched_episodes": 3})
+        self.anilist = [anilist_entry(10, "", progress=3)]
+
+        self.run_sync()
+
+        self.assertEqual(self.watchlist.bulk_ops, [])
+        self.assertEqual(self.stored_entries()["10"]["anime_title"], "Frieren")
+
+
+if __name__ == "__main__":
+    unittest.main()